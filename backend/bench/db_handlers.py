@@ -0,0 +1,86 @@
+"""Load test for the MongoDB-backed job handlers.
+
+Fires concurrent POST /job and GET /job requests at two in-process copies of
+the handlers: the original ones that call mongoengine directly on the event
+loop, and the ones in ``main.py`` that await the DB executor. Requires a
+reachable MongoDB at MONGO_URI.
+
+    cd backend && python -m bench.db_handlers --requests 500 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from config.context import context
+from main import app as executor_app
+from models.job import Job, JobRequest
+
+
+def blocking_app() -> FastAPI:
+    """The handlers as they were before the DB executor: sync calls on the loop."""
+    app = FastAPI()
+
+    @app.post("/job")
+    async def create_job(job: JobRequest):
+        Job(jd_url=job.jd_url, hr_id=job.hr_id).save()
+        return {"success": True}
+
+    @app.get("/job")
+    async def get_job(job_id: str):
+        return Job.objects(id=job_id).first()  # type: ignore
+
+    return app
+
+
+async def load(app: FastAPI, requests: int, concurrency: int, job_id: str) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            async with semaphore:
+                start = time.perf_counter()
+                if i % 2:
+                    await client.post("/job", json={"jd_url": "bench", "hr_id": "bench"})
+                else:
+                    await client.get("/job", params={"job_id": job_id})
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def main(requests: int, concurrency: int):
+    # main.py connects lazily; the seed and the blocking handlers need the connection now.
+    context.db()
+    seed = Job(jd_url="bench", hr_id="bench")
+    seed.save()
+    try:
+        for name, app in (("blocking", blocking_app()), ("executor", executor_app)):
+            result = await load(app, requests, concurrency, str(seed.id))
+            print(f"{name:>9}: {result['rps']:8.1f} req/s  "
+                  f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms")
+    finally:
+        Job.objects(jd_url="bench").delete()  # type: ignore
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
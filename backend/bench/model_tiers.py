@@ -0,0 +1,152 @@
+"""Compare the fast and pro model tiers on real work.
+
+JD extraction: every JD is extracted with both tiers. The benchmark reports
+latency, estimated cost and how well the required skills agree (Jaccard).
+
+Evaluation (``--profile platform=url``, repeatable): every profile is
+evaluated with both tiers. The benchmark reports latency, estimated cost and
+the difference between the locally computed scores (see evaluation.scoring).
+
+Every run bypasses the crawl, search and completion caches (see
+``evaluation.batch.fresh_inputs``) and each tier runs its own compiled plan,
+so neither tier replays what the other fetched or generated. The JD a profile
+is screened against is extracted before timing starts. The tier that runs
+first alternates from one JD or profile to the next, so provider-side warmup
+does not always favour the same tier; bench several to average it out.
+
+Costs come from estimated token counts (tools.trimming) and the
+per-million-token prices in ``PRICES``. Use them to compare tiers, not as a
+bill. Requires GOOGLE_API_KEY, MongoDB, and network access to the JDs and
+profiles.
+
+    cd backend && python -m bench.model_tiers --jd-url https://.../jd.pdf \\
+        --profile github=https://github.com/someone
+"""
+
+import argparse
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.db import connectDb
+from config.portia import FAST_MODEL, PRO_MODEL
+from evaluation.batch import fresh_inputs
+from evaluation.jd_cache import CRITERIA_PROMPT, extract_jd_criteria, get_jd_extraction
+from evaluation.normalize import normalize_evaluation
+from tools.trimming import estimate_tokens
+from evaluation.results import decompress_run
+from evaluation.scoring import score_evaluation
+from tools.pdf_reader import download_pdf, pdf_file_to_text
+from web_scraper.evaluate_platforms import evaluate_platform
+
+TIER_MODELS = {"fast": FAST_MODEL, "pro": PRO_MODEL}
+# USD per million (input, output) tokens.
+PRICES = {
+    "google/gemini-2.5-flash": (0.30, 2.50),
+    "google/gemini-2.5-pro": (1.25, 10.00),
+}
+
+
+def cost(tier: str, input_tokens: int, output_tokens: int) -> Optional[float]:
+    price = PRICES.get(TIER_MODELS[tier])
+    if price is None:
+        return None
+    return (input_tokens * price[0] + output_tokens * price[1]) / 1_000_000
+
+
+def jaccard(a: List[str], b: List[str]) -> float:
+    a_set, b_set = {s.lower() for s in a}, {s.lower() for s in b}
+    return len(a_set & b_set) / len(a_set | b_set) if a_set | b_set else 1.0
+
+
+def tier_order(index: int) -> List[str]:
+    """Tiers in run order for the ``index``-th benchmarked item: alternates."""
+    tiers = list(TIER_MODELS)
+    return tiers if index % 2 == 0 else tiers[::-1]
+
+
+def bench_jd(jd_url: str, order: List[str]) -> Dict[str, Any]:
+    with download_pdf(jd_url) as fp:
+        text = pdf_file_to_text(fp)
+    results: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    for tier in order:
+        with fresh_inputs():
+            start = time.perf_counter()
+            summary = extract_jd_criteria(text, tier)
+            results[tier] = (time.perf_counter() - start, summary)
+
+    skills = {tier: r[1]["key_requirements"]["required_skills"] for tier, r in results.items()}
+    return {
+        "latency": {tier: r[0] for tier, r in results.items()},
+        "cost": {tier: cost(tier, estimate_tokens(CRITERIA_PROMPT + text), estimate_tokens(r[1]))
+                 for tier, r in results.items()},
+        "agreement": jaccard(skills["fast"], skills["pro"]),
+    }
+
+
+def bench_profile(platform: str, url: str, jd_url: Optional[str], order: List[str]) -> Dict[str, Any]:
+    if jd_url:
+        get_jd_extraction(jd_url)  # shared input, not part of either tier's latency
+    latency, costs, scores = {}, {}, {}
+    for tier in order:
+        with fresh_inputs():
+            start = time.perf_counter()
+            summary = evaluate_platform("bench", platform, {"url": url}, jd_url=jd_url,
+                                        keep_raw=True, tier=tier) or {}
+            latency[tier] = time.perf_counter() - start
+        scores[tier] = score_evaluation(normalize_evaluation(summary.get("final_output"), platform))
+        if summary.get("raw_run"):
+            run = decompress_run(summary["raw_run"])
+            # Step outputs are what every later step reads back in; a rough
+            # proxy for input tokens, with the final output as output tokens.
+            step_outputs = (run.get("outputs") or {}).get("step_outputs") or {}
+            costs[tier] = cost(tier, estimate_tokens(step_outputs),
+                               estimate_tokens(summary.get("final_output") or ""))
+    diff = (abs(scores["fast"] - scores["pro"])
+            if scores["fast"] is not None and scores["pro"] is not None else None)
+    return {"latency": latency, "cost": costs, "scores": scores, "score_diff": diff}
+
+
+def _fmt_cost(value: Optional[float]) -> str:
+    return "n/a" if value is None else f"${value:.4f}"
+
+
+def main(jd_urls: List[str], profiles: List[str]) -> None:
+    connectDb()
+    print(f"fast = {FAST_MODEL}, pro = {PRO_MODEL}")
+
+    agreements = []
+    for index, jd_url in enumerate(jd_urls):
+        order = tier_order(index)
+        result = bench_jd(jd_url, order)
+        agreements.append(result["agreement"])
+        print(f"[jd] {jd_url}")
+        for tier in order:
+            print(f"  {tier:>4}: {result['latency'][tier]:6.1f}s  {_fmt_cost(result['cost'][tier])}")
+        print(f"  required-skill agreement: {result['agreement']:.2f}")
+
+    diffs = []
+    for index, profile in enumerate(profiles, start=len(jd_urls)):
+        platform, _, url = profile.partition("=")
+        order = tier_order(index)
+        result = bench_profile(platform, url, jd_urls[0] if jd_urls else None, order)
+        if result["score_diff"] is not None:
+            diffs.append(result["score_diff"])
+        print(f"[{platform}] {url}")
+        for tier in order:
+            print(f"  {tier:>4}: {result['latency'][tier]:6.1f}s  "
+                  f"{_fmt_cost(result['cost'].get(tier))}  score {result['scores'][tier]}")
+
+    if agreements:
+        print(f"mean required-skill agreement: {statistics.mean(agreements):.2f}")
+    if diffs:
+        print(f"mean |fast - pro| score difference: {statistics.mean(diffs):.1f} points")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jd-url", action="append", default=[])
+    parser.add_argument("--profile", action="append", default=[],
+                        help="platform=url, e.g. github=https://github.com/someone")
+    args = parser.parse_args()
+    main(args.jd_url, args.profile)
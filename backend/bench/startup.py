@@ -0,0 +1,81 @@
+"""Startup cost of the API and evaluator modules.
+
+Every measurement runs in a fresh interpreter, so nothing is already
+imported or cached. For each module the benchmark reports the median import
+time and what the import initialized (see config.context). Unless
+``--no-first-use`` is given, it also times the first Mongo connection and the
+first Portia config build, i.e. the cost moved from import to first use.
+
+    cd backend && python -m bench.startup --runs 5 main evaluation.worker
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = ["main", "evaluation.worker", "web_scraper.evaluate_platforms"]
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import {module}
+result = {{"import": time.perf_counter() - start}}
+from config.context import context
+result["initialized"] = context.initialized()
+if {first_use}:
+    for name, init in (("db", context.db), ("config", context.config)):
+        start = time.perf_counter()
+        try:
+            init()
+            result[name] = time.perf_counter() - start
+        except Exception as e:
+            result[name] = f"{{type(e).__name__}}: {{e}}"
+print(json.dumps(result))
+"""
+
+
+def probe(module: str, first_use: bool) -> Dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, first_use=first_use)],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()
+        return {"error": error[-1] if error else f"exit code {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _fmt(value: Any) -> str:
+    return f"{value * 1000:8.1f} ms" if isinstance(value, float) else str(value)
+
+
+def main(modules: List[str], runs: int, first_use: bool) -> None:
+    for module in modules:
+        results = [probe(module, first_use) for _ in range(runs)]
+        ok = [r for r in results if "error" not in r]
+        print(f"[{module}]")
+        if not ok:
+            print(f"  import failed: {results[0]['error']}")
+            continue
+        print(f"  import       {_fmt(statistics.median(r['import'] for r in ok))} (median of {len(ok)})")
+        print(f"  initialized  {ok[-1]['initialized']}")
+        for name in ("db", "config"):
+            timings = [r[name] for r in ok if isinstance(r.get(name), float)]
+            if timings:
+                print(f"  first {name:<6} {_fmt(statistics.median(timings))}")
+            elif name in ok[-1]:
+                print(f"  first {name:<6} {ok[-1][name]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-first-use", dest="first_use", action="store_false")
+    args = parser.parse_args()
+    main(args.modules, args.runs, args.first_use)
@@ -0,0 +1,89 @@
+"""Process-wide resources, created on first use.
+
+Nothing is initialized at import time: importing the API or an evaluator
+module does not connect to Mongo, build a Portia config or start the GitHub
+MCP server. ``context`` creates each resource when it is first asked for and
+hands out the same instance afterwards; ``close()`` releases whatever was
+created. The API calls ``startup()``/``close()`` from its lifespan
+(see main.py); scripts and workers call the getters when they need them.
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
+
+from config.db import db_connected, ensure_db, shutdown_db_executor
+from config.portia import configs_built, get_config
+
+if TYPE_CHECKING:
+    from portia import Config, ToolRegistry
+
+# Connect to Mongo during API startup instead of on the first request.
+APP_WARMUP = os.getenv("APP_WARMUP", "").lower() in ("1", "true", "yes")
+
+
+class AppContext:
+    def __init__(self) -> None:
+        self._default_registries: Dict[str, "ToolRegistry"] = {}
+        self._lock = threading.Lock()
+        self._mcp_started = False
+
+    def db(self) -> None:
+        """Make sure the Mongo connection is registered."""
+        ensure_db()
+
+    def config(self, tier: str = "pro") -> "Config":
+        return get_config(tier)
+
+    def default_tool_registry(self, tier: str = "pro") -> "ToolRegistry":
+        """Portia's default tools for a tier's config, built once per tier."""
+        with self._lock:
+            if tier not in self._default_registries:
+                from portia import DefaultToolRegistry
+
+                self._default_registries[tier] = DefaultToolRegistry(get_config(tier))
+            return self._default_registries[tier]
+
+    def github_mcp_registry(self) -> "ToolRegistry":
+        """The shared GitHub MCP tool registry; starts the server on first use."""
+        from config.mcp import get_github_mcp_registry
+
+        self._mcp_started = True
+        return get_github_mcp_registry()
+
+    def tool_registry(self, tools: Iterable[Any] = (), tier: str = "pro",
+                      github_mcp: bool = True) -> "ToolRegistry":
+        """``tools`` plus the default tools and, optionally, the GitHub MCP tools."""
+        from portia import ToolRegistry
+
+        registry = ToolRegistry(list(tools)) + self.default_tool_registry(tier)
+        if github_mcp:
+            registry = registry + self.github_mcp_registry()
+        return registry
+
+    def startup(self, warm: Optional[bool] = None) -> None:
+        """Optionally (``APP_WARMUP``) connect to Mongo now rather than on first use."""
+        if APP_WARMUP if warm is None else warm:
+            self.db()
+
+    def initialized(self) -> Dict[str, Any]:
+        """What has been created so far, e.g. to check that an import stayed cheap."""
+        return {
+            "db": db_connected(),
+            "configs": configs_built(),
+            "tool_registries": list(self._default_registries),
+            "github_mcp": self._mcp_started,
+        }
+
+    def close(self) -> None:
+        shutdown_db_executor()
+        if self._mcp_started:
+            from config.mcp import shutdown_github_mcp
+
+            shutdown_github_mcp()
+            self._mcp_started = False
+        with self._lock:
+            self._default_registries.clear()
+
+
+context = AppContext()
@@ -1,10 +1,88 @@
+import asyncio
+import threading
 import mongoengine as me
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from os import getenv
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# mongoengine/pymongo are synchronous. Async handlers hand their queries to a
+# dedicated executor sized to the connection pool, so a slow round-trip only
+# occupies one pool slot instead of blocking the event loop.
+DB_POOL_SIZE = int(getenv("MONGO_POOL_SIZE", "20"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_connect_lock = threading.Lock()
+_executor_lock = threading.Lock()
+
 
 def connectDb():
     if getenv("MONGO_URI"):
-        me.connect("hireable", host = getenv("MONGO_URI"))
+        me.connect("hireable", host = getenv("MONGO_URI"), maxPoolSize = DB_POOL_SIZE)
         print("Database connected successfully")
     else:
-      raise ValueError("MONGO_URI not found")
\ No newline at end of file
+      raise ValueError("MONGO_URI not found")
+
+
+def db_connected() -> bool:
+    try:
+        me.get_connection()
+        return True
+    except me.ConnectionFailure:
+        return False
+
+
+def ensure_db() -> None:
+    """Connect on first use. No-op once a connection is registered (also by tests)."""
+    if db_connected():
+        return
+    with _connect_lock:
+        if not db_connected():
+            connectDb()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="mongo")
+        return _executor
+
+
+def _call_with_db(call: Callable[[], T]) -> T:
+    ensure_db()
+    return call()
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking mongoengine call on the DB executor and await its result.
+
+    The connection is made on first use, on the executor rather than the loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), _call_with_db, partial(fn, *args, **kwargs))
+
+
+def shutdown_db_executor():
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+class AsyncDocumentMixin:
+    """Awaitable counterparts of the mongoengine calls used by the API handlers."""
+
+    async def asave(self, **kwargs):
+        return await run_db(self.save, **kwargs)  # type: ignore[attr-defined]
+
+    async def adelete(self, **kwargs):
+        return await run_db(self.delete, **kwargs)  # type: ignore[attr-defined]
+
+    @classmethod
+    async def afirst(cls, **query):
+        return await run_db(lambda: cls.objects(**query).first())  # type: ignore[attr-defined]
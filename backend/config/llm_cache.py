@@ -0,0 +1,156 @@
+"""Content-addressed cache of LLM completions, stored in SQLite.
+
+Portia's models are LangChain chat models, which consult the global LangChain
+LLM cache before calling the provider. The cache key is the model
+configuration (``llm_string``: model name, parameters and bound tool
+schemas) plus the prompt, i.e. the serialized messages including every tool
+output the agent has seen so far. Whitespace is normalized before hashing,
+so formatting-only differences still hit. A rerun of the same evaluation, or
+a retried batch task, therefore replays identical calls from disk.
+
+The store is bounded by ``LLM_CACHE_MAX_BYTES``; least recently used entries
+are evicted first. Set ``LLM_CACHE=off`` to disable the cache, or wrap
+non-deterministic calls in ``llm_cache_disabled()``.
+"""
+
+import contextvars
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.load import dumps, loads
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / ".cache" / "llm.sqlite3"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_disabled: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_disabled", default=False)
+
+
+@contextmanager
+def llm_cache_disabled() -> Iterator[None]:
+    """Bypass the cache (no lookups, no writes) for LLM calls made inside the block."""
+    token = _disabled.set(True)
+    try:
+        yield
+    finally:
+        _disabled.reset(token)
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    normalized = " ".join(prompt.split())
+    return hashlib.sha256(f"{llm_string}\x00{normalized}".encode()).hexdigest()
+
+
+class SQLiteLLMCache(BaseCache):
+    def __init__(self, path: str | Path = DEFAULT_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)")
+        self._conn.commit()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if _disabled.get():
+            return None
+        key = cache_key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # langchain_core.load is flagged beta
+                return loads(row[0])
+        except Exception:
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if _disabled.get():
+            return
+        try:
+            value = dumps(list(return_val))
+        except Exception as e:
+            print(f"LLM cache: could not serialize completion: {e}")
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                (cache_key(prompt, llm_string), value, len(value), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the store is at 90% of ``max_bytes``."""
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        freed = 0
+        stale: list[str] = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY last_used"):
+            if total - freed <= target:
+                break
+            stale.append(key)
+            freed += size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", [(k,) for k in stale])
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_cache: Optional[SQLiteLLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def install_llm_cache() -> Optional[SQLiteLLMCache]:
+    """Install the cache as LangChain's global LLM cache (once); None if disabled."""
+    global _cache
+    if os.getenv("LLM_CACHE", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SQLiteLLMCache(
+                os.getenv("LLM_CACHE_PATH", str(DEFAULT_PATH)),
+                int(os.getenv("LLM_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+            )
+            set_llm_cache(_cache)
+        return _cache
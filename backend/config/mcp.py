@@ -0,0 +1,141 @@
+"""Long-lived GitHub MCP server shared by every evaluation in a process.
+
+``docker run -i --rm ghcr.io/github/github-mcp-server`` per evaluation pays
+container creation and the MCP handshake each time. Instead, one container is
+started per worker process and kept running; MCP sessions attach to it with
+``docker exec``, which skips container creation entirely. The tool registry
+(whose construction performs the tool-listing handshake) is built once and
+handed to every evaluation. Before handing it out the container is
+health-checked and restarted, with a fresh registry, if it has died.
+
+If ``GITHUB_MCP_URL`` is set, an already running server is used over SSE
+instead and no container is managed here.
+"""
+
+import atexit
+import os
+import subprocess
+import threading
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+from portia import McpToolRegistry
+
+load_dotenv()
+
+GITHUB_MCP_IMAGE = os.getenv("GITHUB_MCP_IMAGE", "ghcr.io/github/github-mcp-server")
+GITHUB_MCP_BINARY = "/server/github-mcp-server"
+# Re-check the container at most this often when handing out the registry.
+HEALTH_CHECK_INTERVAL = 30
+
+
+class GithubMcpManager:
+    def __init__(self, github_pat: str, url: Optional[str] = None,
+                 image: str = GITHUB_MCP_IMAGE, container_name: Optional[str] = None):
+        self.github_pat = github_pat
+        self.url = url
+        self.image = image
+        self.container_name = container_name or f"hireable-github-mcp-{os.getpid()}"
+        self._registry: Optional[McpToolRegistry] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _docker(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+        env = {**os.environ, "GITHUB_PERSONAL_ACCESS_TOKEN": self.github_pat}
+        return subprocess.run(["docker", *args], capture_output=True, text=True,
+                              check=check, timeout=120, env=env)
+
+    def is_healthy(self) -> bool:
+        if self.url:
+            return True
+        try:
+            result = self._docker("inspect", "-f", "{{.State.Running}}",
+                                  self.container_name, check=False)
+        except (OSError, subprocess.SubprocessError):
+            return False
+        return result.returncode == 0 and result.stdout.strip() == "true"
+
+    def start(self) -> None:
+        """(Re)start the container. The server idles on its open stdin, keeping it alive."""
+        if self.url:
+            return
+        self._docker("rm", "-f", self.container_name, check=False)
+        self._docker(
+            "run", "-d", "-i",
+            "--name", self.container_name,
+            "-e", "GITHUB_PERSONAL_ACCESS_TOKEN",
+            self.image,
+        )
+        print(f"Started GitHub MCP container {self.container_name}")
+
+    def stop(self) -> None:
+        with self._lock:
+            self._registry = None
+            if not self.url:
+                try:
+                    self._docker("rm", "-f", self.container_name, check=False)
+                except (OSError, subprocess.SubprocessError):
+                    pass
+
+    def _build_registry(self) -> McpToolRegistry:
+        if self.url:
+            return McpToolRegistry.from_sse_connection(server_name="github", url=self.url)
+        return McpToolRegistry.from_stdio_connection(
+            server_name="github",
+            command="docker",
+            args=["exec", "-i", self.container_name, GITHUB_MCP_BINARY, "stdio"],
+            env={"GITHUB_PERSONAL_ACCESS_TOKEN": self.github_pat},
+        )
+
+    def registry(self) -> McpToolRegistry:
+        """Return the shared registry, restarting the server first if it is unhealthy."""
+        with self._lock:
+            now = time.monotonic()
+            if self._registry is not None and now - self._checked_at < HEALTH_CHECK_INTERVAL:
+                return self._registry
+
+            if not self.is_healthy():
+                self._registry = None
+                self.start()
+
+            if self._registry is None:
+                try:
+                    self._registry = self._build_registry()
+                except Exception:
+                    # One retry on a fresh container covers a server that died mid-handshake.
+                    self.start()
+                    self._registry = self._build_registry()
+
+            self._checked_at = now
+            return self._registry
+
+
+_manager: Optional[GithubMcpManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_github_mcp_manager() -> GithubMcpManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            github_pat = os.getenv("GITHUB_PAT")
+            if github_pat is None:
+                raise ValueError("GITHUB_PAT not found")
+            _manager = GithubMcpManager(github_pat, url=os.getenv("GITHUB_MCP_URL"))
+            atexit.register(_manager.stop)
+        return _manager
+
+
+def get_github_mcp_registry() -> McpToolRegistry:
+    """The process-wide GitHub MCP tool registry."""
+    return get_github_mcp_manager().registry()
+
+
+def shutdown_github_mcp() -> None:
+    """Stop the shared server, if one was started in this process."""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.stop()
+            _manager = None
@@ -1,13 +1,85 @@
+"""Portia configs per model tier.
+
+Not every step needs the pro model: extracting a JD's criteria or listing the
+links on a page is extraction work a fast model does as well, at a fraction
+of the latency and cost. Work is routed by tier:
+
+- ``fast``: extraction and link discovery (JD criteria, ``scrapeSocials``).
+- ``pro``: evaluations, i.e. the judgement behind the scores. Introspection
+  and summaries within those runs still use the fast model.
+
+Configs are built on first use by ``get_config``, not at import: importing
+this module does not import Portia. ``config``, ``pro_config`` and
+``fast_config`` are still available as module attributes for existing
+imports (``config`` is the pro tier). Models can be overridden with
+``PORTIA_FAST_MODEL`` and ``PORTIA_PRO_MODEL``.
+"""
+
 import os
+import threading
+from typing import TYPE_CHECKING, Dict
+
 from dotenv import load_dotenv
-from portia import (
-    Config,
-    LLMProvider,
-)
+
+if TYPE_CHECKING:
+    from portia import Config
 
 load_dotenv()
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 
-config = Config.from_default(llm_provider=LLMProvider.GOOGLE,
-                             default_model="google/gemini-2.5-pro",
-                             google_api_key=GOOGLE_API_KEY)
+FAST_MODEL = os.getenv("PORTIA_FAST_MODEL", "google/gemini-2.5-flash")
+PRO_MODEL = os.getenv("PORTIA_PRO_MODEL", "google/gemini-2.5-pro")
+
+# Model per Portia role, per tier.
+TIER_MODELS = {
+    "fast": {
+        "default_model": FAST_MODEL,
+        "planning_model": FAST_MODEL,
+        "execution_model": FAST_MODEL,
+        "introspection_model": FAST_MODEL,
+        "summarizer_model": FAST_MODEL,
+    },
+    "pro": {
+        "default_model": PRO_MODEL,
+        "planning_model": PRO_MODEL,
+        "execution_model": PRO_MODEL,
+        "introspection_model": FAST_MODEL,
+        "summarizer_model": FAST_MODEL,
+    },
+}
+
+_configs: Dict[str, "Config"] = {}
+_lock = threading.Lock()
+
+
+def get_config(tier: str = "pro") -> "Config":
+    """The Portia config of a model tier ('fast' or 'pro'), built on first use."""
+    if tier not in TIER_MODELS:
+        raise ValueError(f"Unknown model tier: {tier}")
+    with _lock:
+        if tier not in _configs:
+            from portia import Config, LLMProvider
+
+            from config.llm_cache import install_llm_cache
+
+            # Identical model calls (same model, prompt and tool outputs) are
+            # replayed from the local completion cache, see config.llm_cache.
+            install_llm_cache()
+            _configs[tier] = Config.from_default(llm_provider=LLMProvider.GOOGLE,
+                                                 google_api_key=GOOGLE_API_KEY,
+                                                 **TIER_MODELS[tier])
+        return _configs[tier]
+
+
+def configs_built() -> list[str]:
+    """Tiers whose config has been built so far."""
+    return list(_configs)
+
+
+_ALIASES = {"config": "pro", "pro_config": "pro", "fast_config": "fast"}
+
+
+def __getattr__(name: str) -> "Config":
+    if name in _ALIASES:
+        return get_config(_ALIASES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
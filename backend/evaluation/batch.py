@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+"""Batch evaluation of many candidates against one JD.
+
+Every (candidate, platform) pair becomes an independent task that is run on a
+bounded thread pool. Evaluations spend almost all of their time waiting on the
+LLM and on crawled pages, so throughput scales with the number of workers.
+Each platform also has its own concurrency limit so a burst of candidates
+cannot hammer a single provider (e.g. LinkedIn rate limits) while the other
+workers sit idle. A task is only handed to the pool once its provider has a
+free slot and its retry backoff has elapsed, so waiting never occupies a worker.
+Given the ``Job``, results are stored as they finish and a re-run batch skips
+what is already stored.
+"""
+
+import contextvars
+import heapq
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from config.llm_cache import llm_cache_disabled
+from evaluation.jd_cache import get_jd_extraction
+from evaluation.normalize import normalize_evaluation
+from evaluation.results import save_evaluation
+from evaluation.scoring import combine_platform_scores, score_evaluations
+from models.evaluation import Evaluation
+from models.job import Job
+from models.user import User
+from tools.web_cache import web_cache_refresh
+from web_scraper.evaluate_platforms import evaluate_platform
+
+# Platform name -> field on ``Socials`` holding the profile URL.
+PLATFORM_URL_FIELDS = {
+    "github": "githubUrl",
+    "leetcode": "leetcodeUrl",
+    "linkedin": "linkedInUrl",
+    "x": "xUrl",
+}
+
+# How often the scheduler retries a task whose provider is at its limit.
+SCHEDULER_POLL_SECONDS = 0.05
+
+# Maximum number of concurrent evaluations per platform.
+DEFAULT_PROVIDER_LIMITS = {
+    "github": 4,
+    "leetcode": 2,
+    "linkedin": 2,
+    "x": 2,
+}
+
+
+@contextmanager
+def fresh_inputs() -> Iterator[None]:
+    """Re-fetch crawls and searches and make real LLM calls inside the block.
+
+    For re-runs whose point is a different answer: a changed profile, a
+    forced re-evaluation or a retry after a bad run. Cached pages and
+    completions would reproduce the previous result exactly.
+    """
+    with llm_cache_disabled(), web_cache_refresh():
+        yield
+
+
+_provider_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_provider_lock = threading.Lock()
+
+
+def provider_semaphore(platform: str, limit: Optional[int] = None) -> threading.BoundedSemaphore:
+    """The process-wide semaphore capping concurrent evaluations of ``platform``.
+
+    Shared by every ``evaluate_candidates`` call in the process (e.g. all
+    queue consumers of a worker), so the limit holds across calls, not per
+    call. The limit is fixed by the first call for the platform (default
+    ``DEFAULT_PROVIDER_LIMITS``); later calls share it whatever they ask for.
+    """
+    with _provider_lock:
+        if platform not in _provider_semaphores:
+            if limit is None:
+                limit = DEFAULT_PROVIDER_LIMITS.get(platform, 1)
+            _provider_semaphores[platform] = threading.BoundedSemaphore(max(1, limit))
+        return _provider_semaphores[platform]
+
+
+class BatchTask(BaseModel):
+    """A single platform evaluation for a single candidate."""
+
+    user_id: str
+    platform: str
+    url: str
+    attempts: int = 0
+    status: str = "pending"  # pending | done | failed
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+
+
+class BatchProgress(BaseModel):
+    """Running counters for a batch, reported after every finished task."""
+
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    retries: int = 0
+    started_at: float = Field(default_factory=time.monotonic)
+
+    @property
+    def finished(self) -> int:
+        return self.done + self.failed
+
+    def report(self) -> str:
+        elapsed = time.monotonic() - self.started_at
+        rate = self.finished / elapsed if elapsed > 0 else 0.0
+        return (
+            f"[batch] {self.finished}/{self.total} finished "
+            f"({self.done} ok, {self.failed} failed, {self.retries} retries) "
+            f"in {elapsed:.1f}s, {rate:.2f} tasks/s"
+        )
+
+
+def build_tasks(users: Iterable[User], platforms: Optional[List[str]] = None) -> List[BatchTask]:
+    """Create one task per candidate platform that has a profile URL."""
+    platforms = platforms or list(PLATFORM_URL_FIELDS)
+    tasks: List[BatchTask] = []
+    for user in users:
+        socials = user.socials
+        for platform in platforms:
+            url = getattr(socials, PLATFORM_URL_FIELDS[platform], "") if socials else ""
+            if url:
+                tasks.append(BatchTask(user_id=str(user.id), platform=platform, url=url))
+    return tasks
+
+
+def stored_result(job: Job, user: User, platform: str) -> Optional[Dict[str, Any]]:
+    """The latest successful ``Evaluation`` of a candidate platform for ``job``,
+    in the form ``evaluate_platform`` returns, or None."""
+    latest = Evaluation.objects(job=job, user=user, platform=platform).order_by(  # type: ignore
+        "-created_at").first()
+    if latest is None or latest.error or not latest.result:
+        return None
+    return {"plan_run_id": latest.plan_run_id, "state": latest.state,
+            "final_output": latest.result, "error": None, "evaluation_id": str(latest.id)}
+
+
+def _succeeded(result: Optional[Dict[str, Any]]) -> bool:
+    """The run completed with a final output that validates (see evaluation.results)."""
+    return (result is not None and str(result.get("state", "")).upper() != "FAILED"
+            and not result.get("error"))
+
+
+def evaluate_candidates(
+    jd_url: str,
+    users: Iterable[User],
+    platforms: Optional[List[str]] = None,
+    max_workers: int = 8,
+    provider_limits: Optional[Dict[str, int]] = None,
+    max_retries: int = 2,
+    backoff_seconds: float = 2.0,
+    on_progress: Optional[Callable[[BatchProgress, BatchTask], None]] = None,
+    keep_raw: bool = False,
+    evaluator: Callable[..., Optional[Dict[str, Any]]] = evaluate_platform,
+    refresh_platforms: Iterable[str] = (),
+    job: Optional[Job] = None,
+) -> Dict[str, Dict[str, BatchTask]]:
+    """Evaluate every candidate's platforms against one JD.
+
+    Args:
+        jd_url: The JD all candidates are screened against.
+        users: Candidate ``User`` documents; their ``socials`` decide which
+               platforms are evaluated.
+        platforms: Restrict the run to these platforms (default: all known).
+        max_workers: Size of the shared worker pool.
+        provider_limits: Per-platform concurrency caps, merged over
+                         ``DEFAULT_PROVIDER_LIMITS``. Caps are process-wide
+                         and fixed by the first call that evaluates a
+                         platform (see ``provider_semaphore``).
+        max_retries: Extra attempts for a task that raised or whose plan run failed.
+        backoff_seconds: Base delay for exponential backoff between attempts.
+        on_progress: Called with the progress counters after each task finishes.
+                     Defaults to printing ``BatchProgress.report()``.
+        keep_raw: Ask the evaluator to also return the compressed raw plan run.
+        evaluator: The per-platform evaluation function.
+        refresh_platforms: Platforms to evaluate with ``fresh_inputs()``
+                           (no crawl, search or LLM cache hits).
+        job: The ``Job`` of ``jd_url``, to make the batch resumable: every
+             successful result is stored as an ``Evaluation`` as soon as it
+             finishes, and platforms that already have one for this job are
+             not evaluated again (unless in ``refresh_platforms``). Run
+             again after a crash, a batch only redoes what had not finished;
+             interrupted plan runs resume from their last completed step.
+
+    Returns:
+        ``{user_id: {platform: BatchTask}}`` with the result or error of every task.
+    """
+    users = list(users)
+    tasks = build_tasks(users, platforms)
+    users_by_id = {str(user.id): user for user in users}
+    refresh = set(refresh_platforms)
+
+    # Warm the JD cache once so workers don't race to download the same PDF.
+    get_jd_extraction(jd_url)
+
+    limits = {**DEFAULT_PROVIDER_LIMITS, **(provider_limits or {})}
+    semaphores = {
+        task.platform: provider_semaphore(task.platform, limits.get(task.platform, 1))
+        for task in tasks
+    }
+    progress = BatchProgress(total=len(tasks))
+    report = on_progress or (lambda p, _: print(p.report()))
+    fresh = [task.platform in refresh for task in tasks]
+    results: Dict[str, Dict[str, BatchTask]] = {}
+
+    def finish(task: BatchTask) -> None:
+        if task.status == "done":
+            progress.done += 1
+        else:
+            task.status = "failed"
+            progress.failed += 1
+        results.setdefault(task.user_id, {})[task.platform] = task
+        report(progress, task)
+
+    pending = []  # heap of (ready_at, task index)
+    for i, task in enumerate(tasks):
+        stored = (stored_result(job, users_by_id[task.user_id], task.platform)
+                  if job is not None and task.platform not in refresh else None)
+        if stored is not None:
+            task.status, task.result = "done", stored
+            finish(task)
+        else:
+            pending.append((0.0, i))
+
+    def attempt(task: BatchTask, fresh_run: bool) -> bool:
+        """One evaluation, holding the provider slot the scheduler acquired.
+
+        Returns whether the run completed but failed or did not validate:
+        replaying its cached pages and completions would reproduce it.
+        """
+        task.attempts += 1
+        try:
+            with fresh_inputs() if fresh_run else nullcontext():
+                result = evaluator(task.user_id, task.platform, {"url": task.url},
+                                   jd_url=jd_url, keep_raw=keep_raw)
+            if _succeeded(result):
+                if job is not None:
+                    evaluation = save_evaluation(job, users_by_id[task.user_id], task.platform, result)
+                    result = {**result, "evaluation_id": str(evaluation.id)}
+                task.status, task.result, task.error = "done", result, None
+                return False
+            task.error = (result or {}).get("error") or "Plan run failed or returned no result"
+            return True
+        except Exception as e:
+            task.error = str(e)
+            return False
+        finally:
+            semaphores[task.platform].release()
+
+    # Tasks wait for their provider slot and their retry backoff here, in
+    # the scheduler, so pool threads only ever run evaluations.
+    running: Dict[Future, int] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            now, blocked = time.monotonic(), []
+            while pending and pending[0][0] <= now and len(running) < max_workers:
+                ready_at, i = heapq.heappop(pending)
+                if semaphores[tasks[i].platform].acquire(blocking=False):
+                    # Each attempt runs in a copy of the caller's context (e.g. llm_cache_disabled).
+                    future = pool.submit(contextvars.copy_context().run, attempt, tasks[i], fresh[i])
+                    running[future] = i
+                else:
+                    blocked.append((ready_at, i))
+            for item in blocked:
+                heapq.heappush(pending, item)
+
+            timeout = None  # a free pool slot is what the next task waits for
+            if blocked:
+                timeout = SCHEDULER_POLL_SECONDS
+            elif pending and len(running) < max_workers:
+                timeout = max(0.0, pending[0][0] - now)
+            if not running:
+                time.sleep(timeout or 0.0)
+                continue
+            finished, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                i = running.pop(future)
+                task = tasks[i]
+                bad_run = future.result()
+                if task.status != "done" and task.attempts <= max_retries:
+                    progress.retries += 1
+                    fresh[i] = fresh[i] or bad_run
+                    delay = backoff_seconds * 2 ** (task.attempts - 1)
+                    heapq.heappush(pending, (time.monotonic() + delay, i))
+                    continue
+                finish(task)
+
+    return results
+
+
+def score_candidates(results: Dict[str, Dict[str, BatchTask]],
+                     platform_weights: Optional[Dict[str, float]] = None) -> Dict[str, Dict[str, Any]]:
+    """Compute per-platform and combined scores for an ``evaluate_candidates`` result.
+
+    All platform results of the batch are scored in one vectorized pass (see
+    evaluation.scoring). Returns ``{user_id: {"platforms": {platform: score},
+    "overall": score}}`` with 0-100 scores, None where nothing could be scored.
+    """
+    keys, normalized = [], []
+    for user_id, tasks in results.items():
+        for platform, task in tasks.items():
+            if task.result is not None:
+                keys.append((user_id, platform))
+                normalized.append(normalize_evaluation(task.result.get("final_output"), platform))
+
+    platform_scores: Dict[str, Dict[str, Optional[float]]] = {user_id: {} for user_id in results}
+    for (user_id, platform), score in zip(keys, score_evaluations(normalized)):
+        platform_scores[user_id][platform] = None if np.isnan(score) else round(float(score), 2)
+
+    overall = combine_platform_scores(platform_scores, platform_weights)
+    return {
+        user_id: {"platforms": scores, "overall": overall.get(user_id)}
+        for user_id, scores in platform_scores.items()
+    }
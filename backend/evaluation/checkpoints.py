@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+"""Step checkpoints, so a failed or killed plan run resumes where it stopped.
+
+After every completed step the plan run, with all step outputs so far, is
+stored in Mongo, keyed by the plan and its input values. Running the same
+plan with the same inputs again resumes after the last completed step instead
+of starting over: a run that crawled for ten minutes and then failed at the
+scoring step only redoes the scoring. Checkpoints are deleted once a run
+completes and expire after ``PLAN_CHECKPOINT_TTL`` seconds.
+
+Checkpoints are written by the ``after_step_execution`` hook in
+``CHECKPOINT_HOOKS``; pass it to the ``Portia`` instances that run plan
+templates (see ``evaluation.plan_templates.run_plan_template``).
+"""
+
+import hashlib
+import json
+import os
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from portia import Plan, PlanInput
+from portia.execution_hooks import ExecutionHooks
+from portia.plan_run import PlanRun, PlanRunState
+
+from evaluation.results import compress_run, decompress_run
+from models.evaluation_task import utcnow
+from models.plan_checkpoint import PlanCheckpoint
+
+PLAN_CHECKPOINT_TTL = int(os.getenv("PLAN_CHECKPOINT_TTL", str(24 * 3600)))
+
+
+def checkpoint_key(plan_id: str, values: Dict[str, Any]) -> str:
+    """Key of a run of ``plan_id`` with the given input values (names with or without ``$``)."""
+    normalized = {name.lstrip("$"): value for name, value in values.items()}
+    payload = json.dumps([plan_id, normalized], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _run_key(plan_run: PlanRun) -> str:
+    values = {name: getattr(value, "value", value)
+              for name, value in (plan_run.plan_run_inputs or {}).items()}
+    return checkpoint_key(str(plan_run.plan_id), values)
+
+
+def save_checkpoint(plan: Plan, plan_run: PlanRun, step: Any, output: Any) -> None:
+    """``after_step_execution`` hook: store the run, resumable from the next step.
+
+    A failing checkpoint write is logged and never fails the run itself.
+    """
+    index = plan_run.current_step_index
+    try:
+        snapshot = plan_run.model_copy(deep=True)
+        snapshot.outputs.step_outputs[step.output] = output
+        snapshot.current_step_index = index + 1
+        now = utcnow()
+        PlanCheckpoint.objects(key=_run_key(plan_run)).update_one(  # type: ignore
+            upsert=True,
+            set__plan_id=str(plan.id),
+            set__plan_run_id=str(plan_run.id),
+            set__next_step=index + 1,
+            set__plan_run=compress_run(snapshot),
+            set__updated_at=now,
+            set__expires_at=now + timedelta(seconds=PLAN_CHECKPOINT_TTL),
+        )
+    except Exception as e:
+        print(f"Could not checkpoint step {index} of plan run {plan_run.id}: {e}")
+
+
+CHECKPOINT_HOOKS = ExecutionHooks(after_step_execution=save_checkpoint)
+
+
+def load_checkpoint(plan: Plan, inputs: List[PlanInput]) -> Optional[PlanRun]:
+    """The checkpointed run of ``plan`` with these inputs, ready to resume, or None."""
+    key = checkpoint_key(str(plan.id), {i.name: i.value for i in inputs})
+    entry = PlanCheckpoint.objects(key=key).first()  # type: ignore
+    if entry is None:
+        return None
+    try:
+        plan_run = PlanRun.model_validate(decompress_run(entry.plan_run))
+    except Exception as e:
+        print(f"Discarding unreadable checkpoint of plan run {entry.plan_run_id}: {e}")
+        entry.delete()
+        return None
+    # A failed run is not resumable as such; restart it at the step that failed.
+    plan_run.state = PlanRunState.IN_PROGRESS
+    plan_run.current_step_index = entry.next_step
+    return plan_run
+
+
+def clear_checkpoint(plan_run: PlanRun) -> None:
+    PlanCheckpoint.objects(key=_run_key(plan_run)).delete()  # type: ignore
+
+
+def drop_checkpoint(plan: Plan, inputs: List[PlanInput]) -> None:
+    """Forget the checkpointed run of ``plan`` with these inputs, so the next run starts over."""
+    key = checkpoint_key(str(plan.id), {i.name: i.value for i in inputs})
+    PlanCheckpoint.objects(key=key).delete()  # type: ignore
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+"""Cheap change detection for candidate profiles.
+
+A fingerprint summarizes what an evaluation of a profile depends on, without
+running the agent: the latest GitHub push, the LeetCode solved counts, or a
+hash of a crawled page's text. It is stored with each ``Evaluation``;
+re-evaluating a candidate only re-runs platforms whose fingerprint changed
+(or could not be computed) and reuses the stored results for the rest.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+from urllib.parse import urlparse
+
+from evaluation.jd_cache import get_jd_extraction
+from models.evaluation import Evaluation
+from models.job import Job
+from models.user import User
+from tools.http import get_session
+from tools.leetcode import LeetCodeAPITool
+
+FINGERPRINT_TIMEOUT = (5.0, 20.0)
+GITHUB_API = "https://api.github.com"
+
+# Hosts that serve a JS-only shell to anonymous clients: the fetched text is
+# the same for every profile, so it says nothing about a change.
+JS_ONLY_HOSTS = frozenset({"x.com", "twitter.com", "mobile.twitter.com", "mobile.x.com"})
+# Login wall URLs; LinkedIn's 200 authwall page is recognized by its markup.
+_LOGIN_WALL = re.compile(r"authwall|/login|/signin|/signup|/uas/login|/checkpoint/", re.I)
+
+_TAGS = re.compile(r"<(script|style|noscript)\b.*?</\1>|<[^>]+>", re.S | re.I)
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _username(url: str) -> str:
+    """Last meaningful path segment: github.com/<user>, leetcode.com/u/<user>/."""
+    parts = [p for p in urlparse(url if "//" in url else f"https://{url}").path.split("/") if p]
+    if parts and parts[0] == "u" and len(parts) > 1:
+        return parts[1]
+    return parts[0] if parts else ""
+
+
+def github_fingerprint(url: str) -> Optional[str]:
+    """Public repo/follower counts and the time of the most recent push."""
+    username = _username(url)
+    if not username:
+        return None
+    headers = {"Accept": "application/vnd.github+json"}
+    if os.getenv("GITHUB_PAT"):
+        headers["Authorization"] = f"Bearer {os.getenv('GITHUB_PAT')}"
+    session = get_session()
+
+    user = session.get(f"{GITHUB_API}/users/{username}", headers=headers, timeout=FINGERPRINT_TIMEOUT)
+    user.raise_for_status()
+    repos = session.get(f"{GITHUB_API}/users/{username}/repos", headers=headers,
+                        params={"sort": "pushed", "per_page": 1}, timeout=FINGERPRINT_TIMEOUT)
+    repos.raise_for_status()
+    profile = user.json()
+    latest = repos.json()
+    return _digest({
+        "public_repos": profile.get("public_repos"),
+        "followers": profile.get("followers"),
+        "pushed_at": latest[0].get("pushed_at") if latest else None,
+    })
+
+
+def leetcode_fingerprint(url: str) -> Optional[str]:
+    """Solved counts per difficulty, fetched fresh (bypassing the response cache)."""
+    username = _username(url)
+    if not username:
+        return None
+    profile = LeetCodeAPITool(use_cache=False).user_profile(username)
+    return _digest({k: profile.get(k) for k in ("totalSolved", "easySolved", "mediumSolved", "hardSolved")})
+
+
+def page_fingerprint(url: str) -> Optional[str]:
+    """Hash of a page's visible text (markup, scripts and whitespace ignored).
+
+    None for JS-only hosts, redirects and login walls: LinkedIn answers
+    anonymous clients with 999, a redirect or a 200 authwall page, none of
+    which change when the profile does.
+    """
+    host = (urlparse(url if "//" in url else f"https://{url}").hostname or "").lower()
+    if host.removeprefix("www.") in JS_ONLY_HOSTS:
+        return None
+    response = get_session().get(url, timeout=FINGERPRINT_TIMEOUT, allow_redirects=False,
+                                 headers={"Accept": "text/html"})
+    if (response.status_code != 200 or _LOGIN_WALL.search(response.url)
+            or "authwall" in response.text.lower()):
+        return None
+    text = " ".join(_TAGS.sub(" ", response.text).split())
+    return _digest(text) if text else None
+
+
+FINGERPRINTERS: Dict[str, Callable[[str], Optional[str]]] = {
+    "github": github_fingerprint,
+    "leetcode": leetcode_fingerprint,
+    "linkedin": page_fingerprint,
+    "x": page_fingerprint,
+}
+
+
+def platform_fingerprint(platform: str, url: str, jd_hash: str = "") -> Optional[str]:
+    """Fingerprint of one profile for one JD version, or None if it cannot be determined.
+
+    None always means "re-run": LinkedIn's auth wall, rate limits and network
+    errors must not cause a stale result to be reused.
+    """
+    fingerprinter = FINGERPRINTERS.get(platform)
+    if fingerprinter is None or not url:
+        return None
+    try:
+        profile = fingerprinter(url)
+    except Exception as e:
+        print(f"Could not fingerprint {platform} profile {url}: {e}")
+        return None
+    return _digest([jd_hash, url, profile]) if profile else None
+
+
+def jd_hash(job: Job) -> Optional[str]:
+    """Content hash of the job's current JD, so a changed JD invalidates every result.
+
+    Revalidated against the JD URL (see ``get_jd_extraction``) rather than read
+    from the last stored extraction. None if the JD cannot be checked.
+    """
+    try:
+        return get_jd_extraction(job.jd_url).content_hash
+    except Exception as e:
+        print(f"Could not check the JD of job {job.id}: {e}")
+        return None
+
+
+def plan_reevaluation(job: Job, user: User, urls: Dict[str, str]
+                      ) -> tuple[Dict[str, Optional[str]], Dict[str, Evaluation], Set[str]]:
+    """Split a candidate's platforms into those to re-run and those to reuse.
+
+    Args:
+        urls: Platform -> profile URL of the platforms to evaluate.
+
+    Returns:
+        ``(fingerprints, reusable, stale)``: the current fingerprint of every
+        platform, the stored ``Evaluation`` for each platform whose fingerprint
+        is unchanged since its latest successful evaluation, and the platforms
+        that were evaluated before but whose fingerprint changed or could not
+        be computed. Re-runs of stale platforms must not be served from the
+        crawl and completion caches, which still hold the previous inputs.
+    """
+    digest = jd_hash(job)
+    if digest is None:
+        fingerprints: Dict[str, Optional[str]] = {p: None for p in urls}
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, len(urls))) as pool:
+            futures = {p: pool.submit(platform_fingerprint, p, url, digest) for p, url in urls.items()}
+            fingerprints = {p: f.result() for p, f in futures.items()}
+
+    reusable: Dict[str, Evaluation] = {}
+    stale: Set[str] = set()
+    for platform, fingerprint in fingerprints.items():
+        latest = Evaluation.objects(job=job, user=user, platform=platform).order_by(  # type: ignore
+            "-created_at").first()
+        if latest is None:
+            continue
+        if fingerprint is not None and latest.fingerprint == fingerprint and not latest.error:
+            reusable[platform] = latest
+        else:
+            stale.add(platform)
+    return fingerprints, reusable, stale
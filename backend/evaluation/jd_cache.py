@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+"""Content-addressed cache of JD text and criteria shared by all evaluators.
+
+A JD is downloaded and parsed once per distinct PDF content. Every later
+evaluation against the same ``jd_url`` reuses the stored pdfminer text and the
+structured ``jd_criteria_summary`` instead of asking the agent to fetch and
+re-extract the JD. Entries are keyed by ``(jd_url, sha256(pdf bytes))`` so a
+changed PDF behind the same URL produces a fresh extraction and the stale
+entries for that URL are dropped.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import IO, Any, Dict, Optional
+
+import requests
+from mongoengine.errors import NotUniqueError
+from portia.model import Message
+
+from config.portia import get_config
+from models.jd_extraction import JdExtraction, JdCriteriaSummary
+from tools.pdf_reader import download_pdf, pdf_file_to_text
+
+# How long an in-process hit is trusted before the URL is revalidated.
+REVALIDATE_SECONDS = 300
+
+_memo: Dict[str, tuple[float, JdExtraction]] = {}
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+CRITERIA_PROMPT = """
+You are given the plain text of a job description (JD). Extract the key criteria
+used to evaluate candidates:
+- title: the job title.
+- key_requirements: required_skills (must-have), preferred_skills (nice-to-have),
+  experience_level and project_requirements.
+- technical_requirements: programming_languages, algorithmic_concepts,
+  problem_complexity and technical_domains.
+- responsibilities: the main responsibilities of the role.
+- role_context: a brief description of the role's domain/industry focus.
+
+Only use information present in the JD. Leave a field empty if the JD does not
+mention it.
+
+JD text:
+"""
+
+
+def content_hash(fp: IO[bytes]) -> str:
+    """sha256 of a file's content, read in chunks and rewound afterwards."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fp.read(64 * 1024), b""):
+        digest.update(chunk)
+    fp.seek(0)
+    return digest.hexdigest()
+
+
+def _lock_for(jd_url: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(jd_url, threading.Lock())
+
+
+def _head(jd_url: str) -> Dict[str, str]:
+    """Return the validators (ETag / Last-Modified) the server exposes, if any."""
+    try:
+        resp = requests.head(jd_url, timeout=(10, 30), allow_redirects=True)
+    except requests.RequestException:
+        return {}
+    if resp.status_code != 200:
+        return {}
+    return {
+        "etag": resp.headers.get("ETag", ""),
+        "last_modified": resp.headers.get("Last-Modified", ""),
+    }
+
+
+def _unchanged(entry: JdExtraction, validators: Dict[str, str]) -> bool:
+    if validators.get("etag") and validators["etag"] == entry.etag:
+        return True
+    if validators.get("last_modified") and validators["last_modified"] == entry.last_modified:
+        return True
+    return False
+
+
+def extract_jd_criteria(text: str, tier: str = "fast") -> Dict[str, Any]:
+    """Ask the ``tier`` model for the structured criteria summary of a JD.
+
+    This is plain extraction, so the fast tier is used by default.
+    """
+    model = get_config(tier).get_default_model()
+    summary = model.get_structured_response(
+        messages=[Message(role="user", content=CRITERIA_PROMPT + text)],
+        schema=JdCriteriaSummary,
+    )
+    return JdCriteriaSummary.model_validate(summary).model_dump()
+
+
+def get_jd_extraction(jd_url: str, refresh: bool = False) -> JdExtraction:
+    """Return the cached extraction for ``jd_url``, building it on first use.
+
+    Args:
+        jd_url: Public URL of the JD PDF.
+        refresh: Skip the in-process memo and the HTTP validators and always
+                 re-download the PDF to compare its content hash.
+    """
+    with _lock_for(jd_url):
+        memo = _memo.get(jd_url)
+        if memo and not refresh and time.monotonic() - memo[0] < REVALIDATE_SECONDS:
+            return memo[1]
+
+        latest = JdExtraction.objects(jd_url=jd_url).order_by("-created_at").first()  # type: ignore
+        validators = _head(jd_url)
+
+        if latest and not refresh and _unchanged(latest, validators):
+            _memo[jd_url] = (time.monotonic(), latest)
+            return latest
+
+        with download_pdf(jd_url) as fp:
+            digest = content_hash(fp)
+            entry = JdExtraction.objects(jd_url=jd_url, content_hash=digest).first()  # type: ignore
+            text = pdf_file_to_text(fp) if entry is None else None
+
+        if entry is None:
+            # The PDF bytes changed (or were never seen): drop stale versions.
+            _drop(jd_url, keep=digest)
+            entry = JdExtraction(
+                jd_url=jd_url,
+                content_hash=digest,
+                text=text,
+                criteria_summary=extract_jd_criteria(text),
+            )
+
+        entry.etag = validators.get("etag", "")
+        entry.last_modified = validators.get("last_modified", "")
+        try:
+            entry.save()
+        except NotUniqueError:
+            # Another process stored this version first; use its entry.
+            entry = JdExtraction.objects.get(jd_url=jd_url, content_hash=digest)  # type: ignore
+            entry.etag = validators.get("etag", "")
+            entry.last_modified = validators.get("last_modified", "")
+            entry.save()
+
+        _memo[jd_url] = (time.monotonic(), entry)
+        return entry
+
+
+def _drop(jd_url: str, keep: Optional[str] = None) -> int:
+    _memo.pop(jd_url, None)
+    entries = JdExtraction.objects(jd_url=jd_url)  # type: ignore
+    if keep is not None:
+        entries = entries.filter(content_hash__ne=keep)
+    return entries.delete()
+
+
+def invalidate_jd(jd_url: str) -> int:
+    """Drop every cached extraction for ``jd_url``. Returns the number removed."""
+    with _lock_for(jd_url):
+        return _drop(jd_url)
+
+
+def jd_prompt_block(entry: JdExtraction) -> str:
+    """Render a cached extraction for inclusion in an evaluator prompt."""
+    return (
+        f"The JD at {entry.jd_url} has already been fetched and its key criteria extracted.\n"
+        "Do not fetch the JD again; use this jd_criteria_summary as the JD criteria:\n"
+        f"{json.dumps(entry.criteria_summary, indent=2)}"
+    )
+
+
+def get_jd_prompt_block(jd_url: str) -> str:
+    return jd_prompt_block(get_jd_extraction(jd_url))
+
+
+def get_jd_criteria(jd_url: str) -> Optional[Dict[str, Any]]:
+    return get_jd_extraction(jd_url).criteria_summary
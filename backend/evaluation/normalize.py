@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+"""Normalize heterogeneous evaluator outputs into one canonical structure.
+
+Evaluator runs do not agree on a shape: the criteria live under
+``evaluation_table``, ``alignment_scores``, ``criteria_analysis``,
+``evaluation`` or ``criteria``; the headline number is ``score``,
+``final_score``, ``overall_match_percentage`` or ``overallScore`` and may be a
+0-10 score, a 0-100 percentage or a string like "10/10" or "71.25%" (see
+``examples/`` and ``other_samples/``). ``normalize_evaluation`` maps all of
+them onto ``NormalizedEvaluation``: criterion scores on a 0-10 scale and the
+overall match as a 0-100 percentage, both plain floats, so ranking and
+aggregation can run as database queries instead of per-document parsing.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel, Field
+
+from models.evaluation import parse_score, scale_score
+
+# Where the list (or dict) of per-criterion results may live.
+CRITERIA_KEYS = ("evaluation_table", "alignment_scores", "criteria_analysis", "evaluation", "criteria")
+
+# Overall values that are already 0-100 percentages.
+PERCENTAGE_PATHS = (
+    "overall_match.percentage",
+    "overall_match.overall_match_percentage",
+    "overall_match_assessment.percentage",
+    "overall_match_assessment.overall_match_percentage",
+    "summary.overall_match_percentage",
+    "final_assessment.overall_match_percentage",
+    "final_score.overall_match_percentage",
+    "final_score.match_percentage",
+    "score.overall_match_percentage",
+    "platform_match_assessment.combined_match_assessment.overall_match_percentage",
+    "overall_match_percentage",
+    "percentage",
+)
+# Overall values that may be a 0-10 score or a percentage, depending on the run.
+SCORE_PATHS = (
+    "score",
+    "final_score.score",
+    "final_score",
+    "final_assessment.overall_score",
+    "overall_score",
+    "overallScore",
+    "computed_overall_platform_score",
+)
+
+STRENGTH_PATHS = (
+    "overall_match.strengths",
+    "overall_match.technical_strengths",
+    "overall_match_assessment.strengths",
+    "summary.strengths",
+    "final_assessment.key_strengths",
+    "final_assessment.key_decision_factors.strengths",
+    "platform_match_assessment.combined_match_assessment.strengths",
+    "strengths",
+)
+GAP_PATHS = (
+    "overall_match.gaps",
+    "overall_match.skill_gaps",
+    "overall_match_assessment.gaps",
+    "summary.gaps",
+    "final_assessment.key_gaps",
+    "final_assessment.key_decision_factors.weaknesses",
+    "platform_match_assessment.combined_match_assessment.gaps",
+    "gaps",
+)
+RATIONALE_PATHS = (
+    "overall_match.rationale",
+    "overall_match.summary",
+    "overall_match",
+    "overall_match_assessment.rationale",
+    "overall_match_assessment.summary",
+    "overall_match_assessment",
+    "final_assessment.rationale",
+    "platform_match_assessment.combined_match_assessment.rationale",
+    "summary",
+    "finalVerdict",
+)
+
+NAME_KEYS = ("criterion", "name", "requirement", "skill")
+SCORE_KEYS = ("score", "combined_score", "score_out_of_10")
+EVIDENCE_KEYS = ("evidence", "candidate_evidence", "explanation", "analysis", "comments")
+
+
+class NormalizedCriterion(BaseModel):
+    criterion: str
+    requirement_type: str = ""
+    score: Optional[float] = None  # 0-10
+    match_status: str = ""
+    evidence: str = ""
+
+
+class NormalizedEvaluation(BaseModel):
+    """The canonical, numerically typed form of any evaluator output."""
+
+    platform: Optional[str] = None
+    source_shape: str = ""
+    overall_percentage: Optional[float] = None  # 0-100
+    criteria: List[NormalizedCriterion] = Field(default_factory=list)
+    strengths: List[str] = Field(default_factory=list)
+    gaps: List[str] = Field(default_factory=list)
+    rationale: str = ""
+    recommendations: List[str] = Field(default_factory=list)
+
+
+def _get(data: Any, path: str) -> Any:
+    for key in path.split("."):
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+def _first(data: Dict[str, Any], paths: Iterable[str], accept=lambda v: v not in (None, "", [], {})):
+    for path in paths:
+        value = _get(data, path)
+        if accept(value):
+            return path, value
+    return None, None
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "; ".join(_text(v) for v in value)
+    return str(value)
+
+
+def _strings(value: Any) -> List[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [_text(v) for v in value if v not in (None, "")]
+    return [_text(value)]
+
+
+def criterion_score(value: Any) -> Optional[float]:
+    """A criterion score on a 0-10 scale ("7/10" -> 7, "70/100" -> 7)."""
+    score = scale_score(value)
+    if score is None:
+        return None
+    return max(0.0, min(10.0, score))
+
+
+def overall_percentage(value: Any, is_percentage: bool) -> Optional[float]:
+    """An overall result as a 0-100 percentage.
+
+    Values found under score-like keys are 0-10 scores when they are at most
+    10 (``m.json``: score 6.45 next to percentage 64.5), percentages otherwise.
+    """
+    if isinstance(value, dict):
+        return None
+    score = parse_score(value)
+    if score is None:
+        return None
+    if isinstance(value, str) and "/" in value:
+        return criterion_score(value) * 10.0  # type: ignore[operator]
+    if not is_percentage and not (isinstance(value, str) and "%" in value) and score <= 10:
+        score *= 10.0
+    return max(0.0, min(100.0, score))
+
+
+def _row(name: str, row: Dict[str, Any]) -> NormalizedCriterion:
+    _, score = _first(row, SCORE_KEYS, accept=lambda v: v is not None)
+    if score is None:
+        # Multi-platform rows (other_samples/n.json) carry one score per platform.
+        score = next((v for k, v in row.items() if k.endswith("_score")), None)
+    _, evidence = _first(row, EVIDENCE_KEYS)
+    if evidence is None:
+        evidence = next((v for k, v in row.items() if "evidence" in k), "")
+    return NormalizedCriterion(
+        criterion=name,
+        requirement_type=_text(row.get("requirement_type") or row.get("priority")).lower(),
+        score=criterion_score(score),
+        match_status=_text(row.get("match_status")),
+        evidence=_text(evidence),
+    )
+
+
+def _criteria(data: Dict[str, Any]) -> tuple[str, List[NormalizedCriterion]]:
+    key, found = _first(data, CRITERIA_KEYS, accept=lambda v: isinstance(v, (list, dict)) and bool(v))
+    rows: List[NormalizedCriterion] = []
+
+    if isinstance(found, list):
+        for row in found:
+            if isinstance(row, dict):
+                _, name = _first(row, NAME_KEYS)
+                rows.append(_row(_text(name), row))
+        return key or "", rows
+
+    # A mapping of criterion -> {score, explanation}: either under a criteria key
+    # (evaluate_platform output) or spread over the top level (l.json).
+    source = found if isinstance(found, dict) else data
+    for name, row in source.items():
+        if isinstance(row, dict) and "score" in row:
+            rows.append(_row(name, row))
+    return (key or "top_level") if rows else "", rows
+
+
+def _unwrap(data: Dict[str, Any]) -> Dict[str, Any]:
+    # {"candidate_assessment_report": {...}} and similar single-key wrappers.
+    while len(data) == 1:
+        (value,) = data.values()
+        if not isinstance(value, dict):
+            break
+        data = value
+    return data
+
+
+def normalize_evaluation(data: Optional[Dict[str, Any]], platform: Optional[str] = None) -> NormalizedEvaluation:
+    """Convert any known evaluator output shape into a ``NormalizedEvaluation``."""
+    if not data:
+        return NormalizedEvaluation(platform=platform)
+    data = _unwrap(data)
+
+    shape, criteria = _criteria(data)
+
+    percentage = None
+    path, value = _first(data, PERCENTAGE_PATHS, accept=lambda v: parse_score(v) is not None and not isinstance(v, dict))
+    if path:
+        percentage = overall_percentage(value, is_percentage=True)
+    else:
+        path, value = _first(data, SCORE_PATHS, accept=lambda v: parse_score(v) is not None and not isinstance(v, dict))
+        if path:
+            percentage = overall_percentage(value, is_percentage=False)
+    if percentage is None:
+        scored = [c.score for c in criteria if c.score is not None]
+        if scored:
+            percentage = sum(scored) / len(scored) * 10.0
+
+    _, strengths = _first(data, STRENGTH_PATHS)
+    _, gaps = _first(data, GAP_PATHS)
+    _, rationale = _first(data, RATIONALE_PATHS, accept=lambda v: isinstance(v, str) and bool(v))
+    recommendations = data.get("recommendations")
+    if isinstance(recommendations, dict):
+        recommendations = recommendations.get("overall") or list(recommendations.values())
+
+    return NormalizedEvaluation(
+        platform=platform or _text(data.get("platform")).lower() or None,
+        source_shape=shape,
+        overall_percentage=percentage,
+        criteria=criteria,
+        strengths=_strings(strengths),
+        gaps=_strings(gaps),
+        rationale=_text(rationale),
+        recommendations=_strings(recommendations),
+    )
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+"""Candidate-level evaluation across all of a candidate's platforms.
+
+Instead of one monolithic run that analyses GitHub, LinkedIn and the rest in a
+single prompt (``other_samples/n.json``), every platform is evaluated by its
+own run, all of them concurrently, so a candidate takes about as long as their
+slowest platform. The per-platform results are then merged locally: scores
+are combined with ``evaluation.scoring`` and criteria assessed on several
+platforms are lined up side by side, without another LLM call.
+
+Platforms the candidate has no profile on (no stored URL, and recorded in
+``Socials.notFound`` by link discovery, see ``discover_socials``) are not
+evaluated at all; they get an explicit "no data" placeholder instead of an
+agent run that searches for a profile that does not exist.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from evaluation.batch import PLATFORM_URL_FIELDS, BatchProgress, BatchTask, evaluate_candidates
+from evaluation.normalize import NormalizedEvaluation, normalize_evaluation
+from evaluation.ranking import skill_key
+from evaluation.scoring import combine_platform_scores, score_evaluations
+from models.user import User
+from web_scraper.evaluate_platforms import evaluate_platform
+
+
+class MergedCriterion(BaseModel):
+    """One criterion with the 0-10 score and evidence from every platform that assessed it."""
+
+    criterion: str
+    requirement_type: str = ""
+    scores: Dict[str, float] = Field(default_factory=dict)
+    evidence: Dict[str, str] = Field(default_factory=dict)
+    combined_score: Optional[float] = None
+
+
+class CandidateEvaluation(BaseModel):
+    user_id: str
+    platforms: Dict[str, BatchTask] = Field(default_factory=dict)
+    # Platform -> why it was not evaluated.
+    no_data: Dict[str, str] = Field(default_factory=dict)
+    platform_scores: Dict[str, Optional[float]] = Field(default_factory=dict)
+    overall: Optional[float] = None
+    criteria: List[MergedCriterion] = Field(default_factory=list)
+    strengths: List[str] = Field(default_factory=list)
+    gaps: List[str] = Field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+
+def merge_platform_results(evaluations: Dict[str, NormalizedEvaluation],
+                           platform_weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Cheap cross-platform merge of normalized platform evaluations.
+
+    Returns the ``CandidateEvaluation`` score, criteria, strength and gap fields.
+    """
+    platforms = list(evaluations)
+    scores = score_evaluations([evaluations[p] for p in platforms])
+    platform_scores = {p: None if np.isnan(s) else round(float(s), 2) for p, s in zip(platforms, scores)}
+    overall = combine_platform_scores({"candidate": platform_scores}, platform_weights)["candidate"]
+
+    merged: Dict[str, MergedCriterion] = {}
+    for platform, evaluation in evaluations.items():
+        for c in evaluation.criteria:
+            if not c.criterion:
+                continue
+            row = merged.setdefault(skill_key(c.criterion), MergedCriterion(
+                criterion=c.criterion, requirement_type=c.requirement_type))
+            if c.score is not None:
+                row.scores[platform] = c.score
+            if c.evidence:
+                row.evidence[platform] = c.evidence
+    for row in merged.values():
+        if row.scores:
+            row.combined_score = round(sum(row.scores.values()) / len(row.scores), 2)
+
+    return {
+        "platform_scores": platform_scores,
+        "overall": overall,
+        "criteria": list(merged.values()),
+        "strengths": [f"{p}: {s}" for p, e in evaluations.items() for s in e.strengths],
+        "gaps": [f"{p}: {g}" for p, e in evaluations.items() for g in e.gaps],
+    }
+
+
+def _no_data_reason(platform: str, user: User) -> str:
+    if user.socials is not None and platform in user.socials.notFound:
+        return f"No {platform} profile found for the candidate; not evaluated"
+    return f"No {platform} profile URL on record; not evaluated"
+
+
+def evaluate_candidate(
+    jd_url: str,
+    user: User,
+    platforms: Optional[List[str]] = None,
+    platform_weights: Optional[Dict[str, float]] = None,
+    max_workers: Optional[int] = None,
+    keep_raw: bool = False,
+    evaluator: Callable[..., Optional[Dict[str, Any]]] = evaluate_platform,
+    on_progress: Optional[Callable[[BatchProgress, BatchTask], None]] = None,
+    refresh_platforms: Iterable[str] = (),
+) -> CandidateEvaluation:
+    """Evaluate all of ``user``'s platforms concurrently and merge the results.
+
+    By default each platform gets its own worker (subject to the batch
+    provider limits, retries and backoff, see ``evaluate_candidates``).
+    Platforms without a profile URL are not evaluated; they are reported in
+    ``no_data`` and score as missing rather than zero. Run link discovery
+    first (``discover_socials``) to fill in the URLs it can find.
+
+    Args:
+        on_progress: Called as each platform finishes (see ``evaluate_candidates``).
+        refresh_platforms: Platforms evaluated without crawl, search or LLM
+                           cache hits (see ``fresh_inputs``).
+    """
+    started = time.monotonic()
+    platforms = platforms or list(PLATFORM_URL_FIELDS)
+    available = [p for p in platforms
+                 if user.socials is not None and getattr(user.socials, PLATFORM_URL_FIELDS[p], "")]
+    no_data = {p: _no_data_reason(p, user) for p in platforms if p not in available}
+
+    tasks: Dict[str, BatchTask] = {}
+    if available:
+        results = evaluate_candidates(
+            jd_url, [user], available,
+            max_workers=max_workers or len(available),
+            keep_raw=keep_raw,
+            evaluator=evaluator,
+            on_progress=on_progress,
+            refresh_platforms=refresh_platforms,
+        )
+        tasks = results.get(str(user.id), {})
+    normalized = {
+        platform: normalize_evaluation(task.result.get("final_output"), platform)
+        for platform, task in tasks.items() if task.result is not None
+    }
+    merged = merge_platform_results(normalized, platform_weights)
+    merged["platform_scores"].update({p: None for p in no_data})
+    return CandidateEvaluation(
+        user_id=str(user.id),
+        platforms=tasks,
+        no_data=no_data,
+        elapsed_seconds=round(time.monotonic() - started, 2),
+        **merged,
+    )
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+"""Reusable, parameterized plans for the evaluators.
+
+The plan for evaluating e.g. a GitHub profile has the same shape for every
+candidate; only the profile URL (and JD context) change. Instead of calling
+``portia.plan()`` on every evaluation, each prompt is planned once with its
+per-candidate values declared as plan inputs (``$profile_url``, ...), the
+resulting plan is serialized to disk and every later evaluation runs the stored
+plan with its own ``plan_run_inputs``.
+
+Templates are keyed by a hash of the prompt and tool ids, so editing a prompt
+or changing the tool set produces a new template automatically.
+
+Template runs are checkpointed after every step (see evaluation.checkpoints):
+running a template again with the same inputs after a failure or crash
+resumes from the last completed step.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List
+
+from portia import Plan, PlanInput, Portia
+from portia.plan_run import PlanRun, PlanRunState
+
+from evaluation.checkpoints import clear_checkpoint, drop_checkpoint, load_checkpoint
+
+PLAN_TEMPLATE_DIR = Path(
+    os.getenv("PLAN_TEMPLATE_DIR", Path(__file__).resolve().parent.parent / ".plan_templates")
+)
+
+_plans: Dict[str, Plan] = {}
+_key_locks: Dict[str, threading.Lock] = {}
+_lock = threading.Lock()
+
+
+def template_key(name: str, prompt: str, tool_ids: List[str]) -> str:
+    digest = hashlib.sha256("\n".join([prompt, *sorted(tool_ids)]).encode()).hexdigest()
+    return f"{name}-{digest[:16]}"
+
+
+def _tool_ids(portia: Portia) -> List[str]:
+    return [tool.id for tool in portia.tool_registry.get_tools()]
+
+
+def get_plan_template(portia: Portia, name: str, prompt: str,
+                      inputs: List[PlanInput]) -> Plan:
+    """Return the compiled plan for ``prompt``, planning it only on first use.
+
+    Args:
+        portia: The Portia instance whose tools the plan may use.
+        name: Human readable template name, used in the file name.
+        prompt: The prompt with ``$input`` placeholders instead of concrete values.
+        inputs: The plan inputs referenced by the prompt. Only names and
+                descriptions are used for planning.
+    """
+    key = template_key(name, prompt, _tool_ids(portia))
+    plan = _plans.get(key)
+    if plan is not None:
+        return plan
+
+    # Planning takes a model call: lock per template, so only concurrent
+    # requests for the same template wait for it.
+    with _lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        plan = _plans.get(key)
+        if plan is not None:
+            return plan
+
+        path = PLAN_TEMPLATE_DIR / f"{key}.json"
+        if path.exists():
+            plan = Plan.model_validate_json(path.read_text())
+        else:
+            plan = portia.plan(
+                prompt,
+                plan_inputs=[PlanInput(name=i.name, description=i.description) for i in inputs],
+            )
+            PLAN_TEMPLATE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(plan.model_dump_json(indent=2))
+            tmp.replace(path)
+            print(f"Compiled plan template {key}")
+            print(plan.pretty_print())
+
+        _plans[key] = plan
+        return plan
+
+
+def run_plan_template(portia: Portia, name: str, prompt: str,
+                      inputs: List[PlanInput], resume: bool = True) -> PlanRun:
+    """Run the cached plan for ``prompt`` with the values carried by ``inputs``.
+
+    If an earlier run with the same inputs failed or was killed, it is resumed
+    from its last checkpointed step. With ``resume`` False its checkpoint is
+    dropped and the plan runs from the first step. Steps are
+    only checkpointed if ``portia`` was created with
+    ``execution_hooks=CHECKPOINT_HOOKS``.
+    """
+    plan = get_plan_template(portia, name, prompt, inputs)
+    if not resume:
+        # Drop the old checkpoint too, so a later retry cannot resume the stale run.
+        drop_checkpoint(plan, inputs)
+    plan_run = load_checkpoint(plan, inputs) if resume else None
+    if plan_run is not None:
+        print(f"Resuming plan run {plan_run.id} of {name} at step {plan_run.current_step_index}")
+        portia.storage.save_plan(plan)
+        plan_run = portia.resume(plan_run)
+    else:
+        plan_run = portia.run_plan(plan, plan_run_inputs=inputs)
+    if plan_run.state == PlanRunState.COMPLETE:
+        clear_checkpoint(plan_run)
+    return plan_run
+
+
+def plan_inputs(descriptions: Dict[str, str], values: Dict[str, Any]) -> List[PlanInput]:
+    """Build plan inputs from ``{name: description}`` and ``{name: value}`` maps."""
+    return [
+        PlanInput(name=name, description=description, value=values.get(name))
+        for name, description in descriptions.items()
+    ]
+
+
+def clear_plan_templates() -> None:
+    """Forget every compiled template, in memory and on disk."""
+    with _lock:
+        _plans.clear()
+        for path in PLAN_TEMPLATE_DIR.glob("*.json"):
+            path.unlink()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+"""Token-budgeted prompt assembly and per-step token reporting.
+
+Evaluator prompts are assembled as a static prefix (role, instructions,
+output schema, rubric), identical for every candidate so the provider can
+cache it, followed by the per-candidate context. The context is trimmed to
+the step token budget. Template prompts (see evaluation.plan_templates) keep
+their per-candidate values in plan inputs instead; ``fit_inputs`` trims those
+to the same budget. Tool outputs are trimmed by the tools themselves (see
+tools.trimming, whose helpers are re-exported here).
+
+Token counts are estimates (``CHARS_PER_TOKEN`` characters per token), close
+enough for budgeting and for following the trend between runs.
+"""
+
+import json
+import os
+from textwrap import dedent
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from tools.trimming import (  # noqa: F401
+    CHARS_PER_TOKEN,
+    TOOL_OUTPUT_TOKEN_BUDGET,
+    compact_text,
+    estimate_tokens,
+    trim_tool_output,
+    truncate_to_tokens,
+)
+
+# Upper bound for an assembled prompt (static prefix + context).
+STEP_TOKEN_BUDGET = int(os.getenv("STEP_TOKEN_BUDGET", "12000"))
+
+
+def _fit(value: Any, max_tokens: int) -> Any:
+    if isinstance(value, str):
+        return truncate_to_tokens(value, max_tokens)
+    return trim_tool_output(value, max_tokens)
+
+
+def assemble_prompt(static_sections: Sequence[str], context: Mapping[str, Any],
+                    budget: int = STEP_TOKEN_BUDGET) -> str:
+    """Static prefix first, then each context section trimmed to fit ``budget``.
+
+    The prefix must not depend on the candidate, so it is byte-identical
+    across runs (and cacheable by the provider). Context sections share what
+    is left of the budget equally.
+    """
+    prefix = "\n\n".join(dedent(section).strip() for section in static_sections)
+    remaining = budget - estimate_tokens(prefix)
+    if remaining <= 0:
+        raise ValueError(f"Static prompt ({estimate_tokens(prefix)} tokens) exceeds the budget of {budget}")
+
+    share = remaining // max(1, len(context))
+    parts = [prefix]
+    for title, value in context.items():
+        text = value if isinstance(value, str) else json.dumps(trim_tool_output(value, share), indent=2)
+        parts.append(f"### {title}\n{truncate_to_tokens(text, share)}")
+    return "\n\n".join(parts)
+
+
+def fit_inputs(template: str, values: Mapping[str, Any],
+               budget: int = STEP_TOKEN_BUDGET) -> Dict[str, Any]:
+    """Trim plan input values so ``template`` with its inputs filled in fits ``budget``.
+
+    Small values (a profile URL) are kept whole; what they leave unused is
+    shared equally by the larger ones (e.g. the JD criteria).
+    """
+    remaining = budget - estimate_tokens(template)
+    if remaining <= 0:
+        raise ValueError(f"Prompt template ({estimate_tokens(template)} tokens) exceeds the budget of {budget}")
+
+    fitted = dict(values)
+    by_size = sorted(values, key=lambda name: estimate_tokens(values[name]))
+    for i, name in enumerate(by_size):
+        share = remaining // (len(by_size) - i)
+        if estimate_tokens(values[name]) > share:
+            fitted[name] = _fit(values[name], share)
+        remaining -= estimate_tokens(fitted[name])
+    return fitted
+
+
+def fill_inputs(template: str, values: Mapping[str, Any]) -> str:
+    """``template`` with its ``$input`` placeholders replaced, as a model would read it."""
+    # Longest names first, so $jd doesn't eat the prefix of $jd_criteria.
+    for name in sorted(values, key=len, reverse=True):
+        value = values[name]
+        template = template.replace(name, value if isinstance(value, str) else json.dumps(value, default=str))
+    return template
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def step_token_report(plan_run: Any, prompt: Optional[str] = None,
+                      plan: Any = None) -> Dict[str, Any]:
+    """Estimated tokens of the prompt and of every step of a plan run.
+
+    Every step reports its output. Given the run's ``plan``, every step also
+    reports its input: the step task plus the values of the plan inputs and
+    earlier step outputs it references, i.e. what the step adds to the
+    execution prompt on top of the fixed tool descriptions.
+    """
+    outputs = getattr(plan_run, "outputs", None)
+    step_outputs = getattr(outputs, "step_outputs", None) or {}
+    run_inputs = getattr(plan_run, "plan_run_inputs", None) or {}
+    variables = {**run_inputs, **step_outputs}
+
+    steps: List[Dict[str, Any]] = []
+    if plan is not None:
+        for index, step in enumerate(plan.steps):
+            referenced = [_value(variables[v.name]) for v in step.inputs if v.name in variables]
+            entry: Dict[str, Any] = {
+                "step": step.output or f"step_{index}",
+                "input_tokens": estimate_tokens(step.task) + sum(estimate_tokens(v) for v in referenced),
+            }
+            if step.output in step_outputs:
+                entry["tokens"] = estimate_tokens(_value(step_outputs[step.output]))
+            steps.append(entry)
+    else:
+        steps = [
+            {"step": name, "tokens": estimate_tokens(_value(output))}
+            for name, output in step_outputs.items()
+        ]
+    report: Dict[str, Any] = {
+        "steps": steps,
+        "step_output_tokens": sum(s.get("tokens", 0) for s in steps),
+    }
+    if plan is not None:
+        report["step_input_tokens"] = sum(s["input_tokens"] for s in steps)
+    if prompt is not None:
+        report["prompt_tokens"] = estimate_tokens(prompt)
+    return report
+
+
+def print_token_report(plan_run: Any, prompt: Optional[str] = None, plan: Any = None) -> None:
+    report = step_token_report(plan_run, prompt, plan)
+    if "prompt_tokens" in report:
+        print(f"[tokens] prompt ~{report['prompt_tokens']}")
+    for step in report["steps"]:
+        sizes = [f"in ~{step['input_tokens']}"] if "input_tokens" in step else []
+        if "tokens" in step:
+            sizes.append(f"out ~{step['tokens']}")
+        print(f"[tokens] {step['step']}: {', '.join(sizes) or 'not run'}")
+    if "step_input_tokens" in report:
+        print(f"[tokens] step inputs total ~{report['step_input_tokens']}")
+    print(f"[tokens] step outputs total ~{report['step_output_tokens']}")
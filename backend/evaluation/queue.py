@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+"""Mongo-backed queue of candidate evaluations.
+
+The API enqueues one ``EvaluationTask`` per candidate and returns straight
+away; any number of worker processes (see ``evaluation.worker``) claim tasks
+with an atomic find-and-modify, so the work can be spread across processes
+and nodes that share the database.
+"""
+
+import os
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from mongoengine.queryset.visitor import Q
+
+from models.evaluation_task import EvaluationRun, EvaluationTask, utcnow
+from models.job import Job
+from models.user import User
+
+# How long a claimed task stays leased without a heartbeat. Workers renew the
+# lease while they run (see ``renew_lease``), so this only bounds how long a
+# crashed worker's task waits before another worker takes it over.
+LEASE_SECONDS = int(os.getenv("EVALUATION_LEASE_SECONDS", str(5 * 60)))
+
+
+def enqueue_evaluation(job: Job, users: List[User], max_attempts: int = 3,
+                       force: bool = False) -> EvaluationRun:
+    """Create a run for ``job`` and one queued task per candidate.
+
+    Unless ``force`` is set, workers reuse a candidate's stored platform
+    results whose profile fingerprint has not changed.
+    """
+    run = EvaluationRun(job=job, candidate_ids=[str(u.id) for u in users])
+    run.save()
+    tasks = [
+        EvaluationTask(run=run, job=job, user=user, max_attempts=max_attempts, force=force)
+        for user in users
+    ]
+    if tasks:
+        EvaluationTask.objects.insert(tasks, load_bulk=False)  # type: ignore
+    return run
+
+
+# Expired leases of tasks with attempts left are reclaimed; at the cap they fail.
+_ATTEMPTS_LEFT = {"$expr": {"$lt": ["$attempts", "$max_attempts"]}}
+_NO_ATTEMPTS_LEFT = {"$expr": {"$gte": ["$attempts", "$max_attempts"]}}
+
+
+def expire_leases(now=None) -> int:
+    """Fail running tasks whose lease expired on their last attempt.
+
+    A task whose worker keeps dying (e.g. killed by the OOM killer on the same
+    candidate) would otherwise be reclaimed forever. Returns the number failed.
+    """
+    now = now or utcnow()
+    return EvaluationTask.objects(  # type: ignore
+        Q(status="running", lease_until__lt=now) & Q(__raw__=_NO_ATTEMPTS_LEFT)
+    ).update(
+        set__status="failed",
+        set__error="Worker lease expired on the last attempt",
+        unset__lease_until=True,
+        set__updated_at=now,
+    )
+
+
+def claim_task(worker_id: str, lease_seconds: int = LEASE_SECONDS) -> Optional[EvaluationTask]:
+    """Atomically take the oldest runnable task, or return None if there is none.
+
+    Runnable are queued tasks and running tasks whose lease expired with
+    attempts left (see ``expire_leases`` for the others).
+    """
+    now = utcnow()
+    expire_leases(now)
+    claimable = Q(status="queued") | (Q(status="running", lease_until__lt=now) & Q(__raw__=_ATTEMPTS_LEFT))
+    return EvaluationTask.objects(claimable).order_by("created_at").modify(  # type: ignore
+        new=True,
+        set__status="running",
+        set__worker_id=worker_id,
+        set__lease_until=now + timedelta(seconds=lease_seconds),
+        set__updated_at=now,
+        inc__attempts=1,
+    )
+
+
+def renew_lease(task: EvaluationTask, worker_id: str, lease_seconds: int = LEASE_SECONDS) -> bool:
+    """Extend the lease of a task ``worker_id`` still holds; False if it has lost it."""
+    now = utcnow()
+    updated = EvaluationTask.objects(id=task.id, status="running", worker_id=worker_id).update_one(  # type: ignore
+        set__lease_until=now + timedelta(seconds=lease_seconds),
+        set__updated_at=now,
+    )
+    return bool(updated)
+
+
+def complete_task(task: EvaluationTask, result: Dict[str, Any]) -> None:
+    task.update(set__status="done", set__result=result, unset__error=True,
+                unset__lease_until=True, set__updated_at=utcnow())
+
+
+def fail_task(task: EvaluationTask, error: str) -> None:
+    """Record a failure, re-queueing the task while it has attempts left."""
+    status = "queued" if task.attempts < task.max_attempts else "failed"
+    task.update(set__status=status, set__error=error,
+                unset__lease_until=True, set__updated_at=utcnow())
+
+
+def run_status(run: EvaluationRun) -> Dict[str, Any]:
+    """Summarise the progress of a run from the state of its tasks."""
+    tasks = EvaluationTask.objects(run=run).only(  # type: ignore
+        "user", "status", "attempts", "error", "result", "updated_at").no_dereference()
+    counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+    candidates = []
+    for task in tasks:
+        counts[task.status] += 1
+        candidates.append({
+            "user_id": str(task.user.id),
+            "status": task.status,
+            "attempts": task.attempts,
+            "error": task.error,
+            "result": task.result or None,
+        })
+
+    total = sum(counts.values())
+    finished = counts["done"] + counts["failed"]
+    if finished == total:
+        status = "failed" if counts["failed"] == total and total else "done"
+    elif counts["running"] or finished:
+        status = "running"
+    else:
+        status = "queued"
+
+    return {
+        "run_id": str(run.id),
+        "job_id": str(run.job.id),
+        "status": status,
+        "counts": counts,
+        "total": total,
+        "candidates": candidates,
+    }
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+"""Per-job candidate ranking backed by ``CandidateScore``.
+
+Every time a candidate's evaluations for a job change, their scores are
+folded into one ``CandidateScore`` row (overall and per-platform score,
+required-skill gap flags). Shortlists are then index scans over
+``(job, -overall, _id)`` with keyset pagination, which stays fast however
+many evaluations a job accumulates, unlike ``skip``-based paging.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from mongoengine.queryset.visitor import Q
+
+from evaluation.normalize import NormalizedCriterion, NormalizedEvaluation
+from evaluation.scoring import combine_platform_scores, requirement_tier
+from models.candidate_score import CandidateScore
+from models.evaluation import Evaluation
+from models.evaluation_task import utcnow
+from models.jd_extraction import JdExtraction
+from models.job import Job
+from models.user import User
+
+PLATFORM_SCORE_FIELDS = {
+    "github": "github_score",
+    "leetcode": "leetcode_score",
+    "linkedin": "linkedin_score",
+    "x": "x_score",
+}
+
+# A required skill whose best matching criterion scores below this (0-10) is a gap.
+GAP_SCORE = 5.0
+
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+def skill_key(name: str) -> str:
+    return " ".join(name.lower().replace("_", " ").split())
+
+
+def skill_tokens(name: str) -> Tuple[str, ...]:
+    """Whole words of a skill or criterion name; ``+`` and ``#`` are part of a word (C++, C#)."""
+    return tuple(_TOKEN.findall(name.lower()))
+
+
+def _contains(tokens: Tuple[str, ...], part: Tuple[str, ...]) -> bool:
+    n = len(part)
+    return n > 0 and any(tokens[i:i + n] == part for i in range(len(tokens) - n + 1))
+
+
+def covers(criterion: str, skill: str) -> bool:
+    """Whether a criterion assesses a skill: one name's words appear, in order, in the other's.
+
+    "Go" matches "Go concurrency" but not "Good commits"; "Java" does not match "JavaScript".
+    """
+    a, b = skill_tokens(criterion), skill_tokens(skill)
+    return _contains(a, b) or _contains(b, a)
+
+
+def required_skills(job: Job) -> List[str]:
+    """Required skills of the job's most recently extracted JD (no network access)."""
+    entry = JdExtraction.objects(jd_url=job.jd_url).order_by("-created_at").first()  # type: ignore
+    if entry is None:
+        return []
+    return list((entry.criteria_summary or {}).get("key_requirements", {}).get("required_skills", []))
+
+
+def _is_gap(criteria: List[NormalizedCriterion]) -> bool:
+    scores = [c.score for c in criteria if c.score is not None]
+    if scores:
+        return max(scores) < GAP_SCORE
+    return all("gap" in c.match_status.lower() for c in criteria)
+
+
+def required_gaps(evaluations: Iterable[NormalizedEvaluation], skills: Iterable[str]) -> List[str]:
+    """Skill keys of the required skills (and critical criteria) the candidate falls short on.
+
+    A skill counts as a gap only when some criterion on some platform covers
+    it and none of them reaches ``GAP_SCORE``; unassessed skills are not flagged.
+    """
+    criteria = [c for e in evaluations for c in e.criteria if c.criterion]
+    gaps = set()
+    for skill in skills:
+        key = skill_key(skill)
+        matching = [c for c in criteria if covers(c.criterion, skill)]
+        if matching and _is_gap(matching):
+            gaps.add(key)
+    for c in criteria:
+        if requirement_tier(c.requirement_type) == "critical" and _is_gap([c]):
+            gaps.add(skill_key(c.criterion))
+    return sorted(gaps)
+
+
+def update_candidate_score(job: Job, user: User) -> CandidateScore:
+    """Rebuild the ranking row of ``user`` for ``job`` from their latest evaluation per platform."""
+    latest: Dict[str, Evaluation] = {}
+    for evaluation in Evaluation.objects(job=job, user=user).order_by("-created_at"):  # type: ignore
+        latest.setdefault(evaluation.platform, evaluation)
+
+    platform_scores = {p: e.overall_percentage for p, e in latest.items()}
+    overall = combine_platform_scores({"user": platform_scores})["user"]
+    normalized = [NormalizedEvaluation.model_validate(e.normalized or {}) for e in latest.values()]
+
+    fields: Dict[str, Any] = {
+        "set__overall": overall,
+        "set__required_gaps": required_gaps(normalized, required_skills(job)),
+        "set__evaluation_ids": {p: str(e.id) for p, e in latest.items()},
+        "set__updated_at": utcnow(),
+    }
+    for platform, field in PLATFORM_SCORE_FIELDS.items():
+        fields[f"set__{field}"] = platform_scores.get(platform)
+
+    return CandidateScore.objects(job=job, user=user).modify(  # type: ignore
+        upsert=True, new=True, **fields)
+
+
+def rebuild_job_scores(job: Job) -> int:
+    """Backfill the ranking rows of every candidate evaluated for ``job``."""
+    user_ids = Evaluation.objects(job=job).distinct("user")  # type: ignore
+    for user in user_ids:
+        update_candidate_score(job, user)
+    return len(user_ids)
+
+
+def encode_cursor(row: CandidateScore) -> str:
+    return f"{row.overall!r}:{row.id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[float, ObjectId]:
+    score, _, row_id = cursor.rpartition(":")
+    if not ObjectId.is_valid(row_id):
+        raise ValueError("Invalid cursor")
+    return float(score), ObjectId(row_id)
+
+
+def rank_candidates(job: Job, limit: int = 20, min_score: Optional[float] = None,
+                    no_gap: Iterable[str] = (), cursor: Optional[str] = None
+                    ) -> Tuple[List[CandidateScore], Optional[str]]:
+    """One page of a job's candidates, best first.
+
+    Args:
+        min_score: Only candidates whose overall score is at least this (0-100).
+        no_gap: Skills the candidate must not have a required-skill gap in.
+        cursor: ``next_cursor`` of the previous page.
+
+    Returns:
+        ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+        Candidates without an overall score are not ranked.
+    """
+    query = Q(job=job, overall__ne=None)
+    if min_score is not None:
+        query &= Q(overall__gte=min_score)
+    gaps = [skill_key(s) for s in no_gap]
+    if gaps:
+        query &= Q(required_gaps__nin=gaps)
+    if cursor:
+        score, row_id = decode_cursor(cursor)
+        query &= Q(overall__lt=score) | Q(overall=score, id__gt=row_id)
+
+    rows = list(CandidateScore.objects(query).no_dereference()  # type: ignore
+                .order_by("-overall", "id").limit(limit + 1))
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def candidate_rows(rows: List[CandidateScore]) -> List[Dict[str, Any]]:
+    """API representation of ranking rows, with candidate names fetched in one query."""
+    user_ids = [row.user.id for row in rows]
+    users = {u.id: u for u in User.objects(id__in=user_ids).only("name", "email")}  # type: ignore
+    result = []
+    for row in rows:
+        user = users.get(row.user.id)
+        result.append({
+            "user_id": str(row.user.id),
+            "name": user.name if user else None,
+            "email": user.email if user else None,
+            "overall": row.overall,
+            "platforms": {p: getattr(row, f) for p, f in PLATFORM_SCORE_FIELDS.items()
+                          if getattr(row, f) is not None},
+            "required_gaps": row.required_gaps,
+            "evaluation_ids": row.evaluation_ids,
+        })
+    return result
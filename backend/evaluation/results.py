@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+"""Turn plan runs into compact, validated evaluation results.
+
+``plan_run.model_dump()`` carries every step output and full tool payload,
+which is megabytes per candidate. Only the final JSON the evaluator was asked
+to produce is kept: it is parsed out of the final output, validated against
+``EvaluationResult`` and stored as an ``Evaluation`` document linked to the
+job and candidate, together with its ``normalize_evaluation`` form whose
+numeric fields are what queries sort and filter on. The raw run is kept only on request, zlib-compressed.
+"""
+
+import json
+import re
+import zlib
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from evaluation.normalize import normalize_evaluation
+from evaluation.scoring import score_evaluation
+from models.evaluation import Evaluation, EvaluationResult
+from models.job import Job
+from models.user import User
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+
+def parse_json_output(value: Any) -> Optional[Dict[str, Any]]:
+    """Best-effort parse of a final output into a JSON object.
+
+    Handles dicts, pydantic models, and strings with or without ```json fences
+    or surrounding prose.
+    """
+    if value is None:
+        return None
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return value
+    text = str(value).strip()
+
+    candidates = [m.group(1) for m in _FENCE.finditer(text)] + [text]
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        candidates.append(text[start:end + 1])
+
+    for candidate in candidates:
+        try:
+            parsed = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+    return None
+
+
+def extract_final_json(plan_run: Any) -> Optional[Dict[str, Any]]:
+    """The final JSON object produced by a plan run, if any."""
+    outputs = getattr(plan_run, "outputs", None)
+    final_output = getattr(outputs, "final_output", None)
+    return parse_json_output(getattr(final_output, "value", None))
+
+
+def compress_run(plan_run: Any) -> bytes:
+    return zlib.compress(plan_run.model_dump_json().encode(), level=6)
+
+
+def decompress_run(data: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(data))
+
+
+def summarize_plan_run(plan_run: Any, keep_raw: bool = False) -> Dict[str, Any]:
+    """Compact summary of a plan run: its id, state and final JSON.
+
+    ``raw_run`` (compressed bytes) is included only when ``keep_raw`` is set.
+    """
+    final = extract_final_json(plan_run)
+    state = str(getattr(plan_run.state, "value", plan_run.state))
+    error = None
+    if state.upper() == "FAILED":
+        # The final output of a failed run is the error that stopped it.
+        detail = getattr(getattr(plan_run.outputs, "final_output", None), "value", None)
+        error = f"Plan run failed: {detail}" if detail else "Plan run failed"
+    else:
+        error = validate_result(final)[1]
+    summary: Dict[str, Any] = {
+        "plan_run_id": str(plan_run.id),
+        "state": state,
+        "final_output": final,
+        "error": error,
+    }
+    if keep_raw:
+        summary["raw_run"] = compress_run(plan_run)
+    return summary
+
+
+def validate_result(data: Optional[Dict[str, Any]]) -> tuple[Optional[EvaluationResult], Optional[str]]:
+    """Validate a final JSON object; returns ``(result, error)``, exactly one of them set."""
+    if data is None:
+        return None, "Final output was not a JSON object"
+    try:
+        return EvaluationResult.model_validate(data), None
+    except ValidationError as e:
+        return None, f"Final output failed validation: {e}"
+
+
+def save_evaluation(job: Job, user: User, platform: str, summary: Dict[str, Any],
+                    fingerprint: Optional[str] = None) -> Evaluation:
+    """Persist a ``summarize_plan_run`` summary as an ``Evaluation`` document.
+
+    Raises:
+        ValueError: If the final output does not validate as an ``EvaluationResult``.
+    """
+    final_output = summary.get("final_output")
+    result, error = validate_result(final_output)
+    if result is None:
+        raise ValueError(error)
+    normalized = normalize_evaluation(final_output, platform)
+    # Computed from the criterion scores; the model's own figure is only a fallback.
+    overall = score_evaluation(normalized)
+    if overall is None:
+        overall = normalized.overall_percentage
+    evaluation = Evaluation(
+        job=job,
+        user=user,
+        platform=platform,
+        plan_run_id=summary.get("plan_run_id"),
+        state=summary.get("state"),
+        score=result.score,
+        overall_percentage=overall,
+        normalized=normalized.model_dump(),
+        result=result.model_dump(),
+        error=summary.get("error"),
+        raw_run=summary.get("raw_run"),
+        fingerprint=fingerprint,
+    )
+    evaluation.save()
+    return evaluation
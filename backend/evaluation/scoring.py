@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+"""Deterministic scoring of normalized evaluations.
+
+The LLM is only asked for per-criterion 0-10 scores and requirement types;
+overall numbers are computed here. Left to the model the arithmetic is not
+reproducible (``examples/y.json`` reports 8.0 and 9.125 for the same run) and
+costs output tokens. All functions work on whole batches at once with numpy.
+
+Weighting: criteria are grouped by requirement tier and every tier present
+contributes its share of ``REQUIREMENT_WEIGHTS`` (critical 70 / important 20 /
+preferred 10, renormalized over the tiers that actually occur). Within a tier,
+criteria are averaged using optional per-criterion weights.
+"""
+
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from evaluation.normalize import NormalizedEvaluation
+
+REQUIREMENT_WEIGHTS = {"critical": 0.7, "important": 0.2, "preferred": 0.1}
+TIERS = tuple(REQUIREMENT_WEIGHTS)
+# Criteria without (or with an unrecognized) requirement type.
+DEFAULT_TIER = "important"
+
+REQUIREMENT_ALIASES = {
+    "required": "critical",
+    "must-have": "critical",
+    "must have": "critical",
+    "mandatory": "critical",
+    "essential": "critical",
+    "core": "critical",
+    "supporting": "important",
+    "nice-to-have": "preferred",
+    "nice to have": "preferred",
+    "optional": "preferred",
+    "bonus": "preferred",
+}
+
+# Relative criterion weights within a tier, per platform (criterion names are
+# matched case-insensitively, with spaces and underscores treated alike).
+CRITERION_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "github": {"commits": 1.0, "code quality": 0.2, "recent work consistency": 0.4},
+}
+
+
+def requirement_tier(requirement_type: Optional[str]) -> str:
+    key = (requirement_type or "").strip().lower()
+    key = REQUIREMENT_ALIASES.get(key, key)
+    return key if key in REQUIREMENT_WEIGHTS else DEFAULT_TIER
+
+
+def _criterion_key(name: str) -> str:
+    return " ".join(name.replace("_", " ").lower().split())
+
+
+def score_evaluations(evaluations: Sequence[NormalizedEvaluation],
+                      criterion_weights: Optional[Mapping[str, Mapping[str, float]]] = None) -> np.ndarray:
+    """Weighted overall match (0-100) of each evaluation; NaN where nothing was scored."""
+    criterion_weights = CRITERION_WEIGHTS if criterion_weights is None else criterion_weights
+    n = len(evaluations)
+    m = max((len(e.criteria) for e in evaluations), default=0)
+    scores = np.full((n, m), np.nan)
+    weights = np.zeros((n, m))
+    tiers = np.zeros((n, m), dtype=np.int8)
+
+    for i, evaluation in enumerate(evaluations):
+        platform_weights = {_criterion_key(k): w for k, w in
+                            criterion_weights.get(evaluation.platform or "", {}).items()}
+        for j, criterion in enumerate(evaluation.criteria):
+            if criterion.score is None:
+                continue
+            scores[i, j] = criterion.score
+            weights[i, j] = platform_weights.get(_criterion_key(criterion.criterion), 1.0)
+            tiers[i, j] = TIERS.index(requirement_tier(criterion.requirement_type))
+
+    scored = ~np.isnan(scores)
+    values = np.where(scored, scores, 0.0) * weights
+    numerator = np.zeros(n)
+    denominator = np.zeros(n)
+    for t, tier in enumerate(TIERS):
+        mask = scored & (tiers == t)
+        tier_weight = (weights * mask).sum(axis=1)
+        present = tier_weight > 0
+        tier_mean = np.divide((values * mask).sum(axis=1), tier_weight,
+                              out=np.zeros(n), where=present)
+        numerator += REQUIREMENT_WEIGHTS[tier] * tier_mean * present
+        denominator += REQUIREMENT_WEIGHTS[tier] * present
+
+    return np.divide(numerator * 10.0, denominator, out=np.full(n, np.nan), where=denominator > 0)
+
+
+def score_evaluation(evaluation: NormalizedEvaluation) -> Optional[float]:
+    """Weighted overall match (0-100) of a single evaluation, or None."""
+    (score,) = score_evaluations([evaluation])
+    return None if np.isnan(score) else round(float(score), 2)
+
+
+def combine_platform_scores(platform_scores: Mapping[str, Mapping[str, Optional[float]]],
+                            platform_weights: Optional[Mapping[str, float]] = None) -> Dict[str, Optional[float]]:
+    """Combine per-platform percentages into one percentage per candidate.
+
+    ``platform_scores`` maps candidate id -> platform -> 0-100 score. Platforms
+    without a score are left out of that candidate's average rather than
+    counted as zero. Platforms default to equal weight.
+    """
+    ids = list(platform_scores)
+    platforms = sorted({p for scores in platform_scores.values() for p in scores})
+    matrix = np.array([[np.nan if platform_scores[i].get(p) is None else platform_scores[i][p]
+                        for p in platforms] for i in ids], dtype=float).reshape(len(ids), len(platforms))
+    weights = np.array([(platform_weights or {}).get(p, 1.0) for p in platforms], dtype=float)
+
+    present = ~np.isnan(matrix)
+    total = (present * weights).sum(axis=1)
+    combined = np.divide((np.where(present, matrix, 0.0) * weights).sum(axis=1), total,
+                         out=np.full(len(ids), np.nan), where=total > 0)
+    return {i: None if np.isnan(s) else round(float(s), 2) for i, s in zip(ids, combined)}
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+"""Worker process draining the Mongo evaluation queue.
+
+Run one or more of these next to the API (on the same or other machines):
+
+    cd backend && python -m evaluation.worker --concurrency 4
+"""
+
+import argparse
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from config.db import connectDb
+from evaluation.batch import PLATFORM_URL_FIELDS, BatchProgress, BatchTask
+from evaluation.fingerprints import plan_reevaluation
+from evaluation.orchestrator import evaluate_candidate
+from evaluation.queue import LEASE_SECONDS, claim_task, complete_task, fail_task, renew_lease
+from evaluation.ranking import update_candidate_score
+from evaluation.results import save_evaluation
+from models.evaluation_task import EvaluationTask
+from web_scraper.scrape_socials import discover_socials, missing_socials
+
+
+# Keep the compressed raw plan run next to each evaluation (debugging only).
+KEEP_RAW_RUNS = os.getenv("KEEP_RAW_RUNS", "").lower() in ("1", "true", "yes")
+
+
+# Platform statuses a re-claimed task does not redo.
+FINISHED_STATUSES = ("done", "reused", "no_data")
+
+
+def process_task(task: EvaluationTask, platform_workers: int = 4) -> Dict[str, Any]:
+    """Evaluate every platform of the task's candidate against the task's job.
+
+    Profile URLs missing from the candidate's socials are looked for first
+    (see ``discover_socials``); platforms without a profile are not evaluated.
+    Platforms whose profile fingerprint is unchanged since their last
+    evaluation for this job are not re-run (unless the task is forced); their
+    stored result is reused. Each new platform result is stored as an
+    ``Evaluation`` document as soon as it finishes and recorded on the task,
+    so a task re-claimed after a worker crash only redoes the platforms that
+    had not finished (in-flight plan runs resume from their last completed
+    step, see evaluation.checkpoints). The candidate's ranking row for the
+    job is refreshed; the task itself only keeps a compact per-platform status.
+    """
+    job, user = task.job, task.user
+    summary: Dict[str, Any] = {
+        platform: entry for platform, entry in (task.result or {}).items()
+        if entry.get("status") in FINISHED_STATUSES
+    }
+    # Look for the profiles the candidate has no URL for once, before the
+    # first evaluation; what discovery finds (or rules out) is stored on the user.
+    if missing_socials(user) and (user.resume_url or user.portfolio_url):
+        try:
+            discover_socials(user)
+        except Exception as e:
+            print(f"Social link discovery failed for user {user.id}: {e}")
+    socials = user.socials
+    urls = {p: getattr(socials, field, "") for p, field in PLATFORM_URL_FIELDS.items()
+            if p not in summary and socials is not None and getattr(socials, field, "")}
+    fingerprints, reusable, stale = plan_reevaluation(job, user, urls)
+    if task.force:
+        reusable = {}
+
+    def record(platform: str, entry: Dict[str, Any]) -> None:
+        summary[platform] = entry
+        task.update(**{f"set__result__{platform}": entry})
+
+    for platform, evaluation in reusable.items():
+        record(platform, {"status": "reused", "attempts": 0, "error": None,
+                          "evaluation_id": str(evaluation.id), "score": evaluation.score})
+
+    def on_progress(progress: BatchProgress, t: BatchTask) -> None:
+        print(progress.report())
+        entry: Dict[str, Any] = {"status": t.status, "attempts": t.attempts, "error": t.error}
+        if t.result is not None:
+            evaluation = save_evaluation(job, user, t.platform, t.result, fingerprints.get(t.platform))
+            entry.update(evaluation_id=str(evaluation.id), score=evaluation.score,
+                         error=t.error or evaluation.error)
+        record(t.platform, entry)
+
+    rerun = [p for p in PLATFORM_URL_FIELDS if p not in summary]
+    candidate = None
+    if rerun:
+        # Forced and fingerprint-triggered re-runs must really re-run: re-fetch
+        # pages and searches and make real LLM calls instead of replaying caches.
+        refresh = rerun if task.force else [p for p in rerun if p in stale]
+        candidate = evaluate_candidate(job.jd_url, user, platforms=rerun,
+                                       max_workers=platform_workers, keep_raw=KEEP_RAW_RUNS,
+                                       on_progress=on_progress, refresh_platforms=refresh)
+
+    for platform, reason in (candidate.no_data if candidate else {}).items():
+        record(platform, {"status": "no_data", "attempts": 0, "error": reason})
+    if any(entry.get("evaluation_id") for entry in summary.values()):
+        update_candidate_score(job, user)
+    return summary
+
+
+@contextmanager
+def lease_heartbeat(task: EvaluationTask, worker_id: str,
+                    interval: float = LEASE_SECONDS / 3) -> Iterator[None]:
+    """Renew the task's lease every ``interval`` seconds while the block runs,
+    so a long evaluation is not re-claimed and run twice."""
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(interval):
+            if not renew_lease(task, worker_id):
+                print(f"[{worker_id}] lost the lease of task {task.id}")
+                return
+
+    thread = threading.Thread(target=beat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def worker_loop(worker_id: str, stop: threading.Event, poll_interval: float = 2.0,
+                platform_workers: int = 4) -> None:
+    while not stop.is_set():
+        task = claim_task(worker_id)
+        if task is None:
+            stop.wait(poll_interval)
+            continue
+
+        print(f"[{worker_id}] evaluating user {task.user.id} (attempt {task.attempts})")
+        try:
+            with lease_heartbeat(task, worker_id):
+                result = process_task(task, platform_workers)
+        except Exception as e:
+            fail_task(task, str(e))
+            continue
+
+        if result and all(r["status"] == "failed" for r in result.values()):
+            fail_task(task, "All platform evaluations failed")
+        else:
+            complete_task(task, result)
+
+
+def run_worker(concurrency: int = 2, poll_interval: float = 2.0, platform_workers: int = 4) -> None:
+    """Start ``concurrency`` queue consumers in this process and block until interrupted."""
+    connectDb()
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=worker_loop,
+            args=(f"{prefix}:{i}", stop, poll_interval, platform_workers),
+            daemon=True,
+        )
+        for i in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    print(f"Worker {prefix} started with {concurrency} consumers")
+
+    try:
+        while any(thread.is_alive() for thread in threads):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluation queue worker")
+    parser.add_argument("--concurrency", type=int, default=2,
+                        help="Candidates evaluated in parallel by this process")
+    parser.add_argument("--platform-workers", type=int, default=4,
+                        help="Platform evaluations run in parallel per candidate")
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    args = parser.parse_args()
+    run_worker(args.concurrency, args.poll_interval, args.platform_workers)
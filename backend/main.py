@@ -1,14 +1,30 @@
-from fastapi import FastAPI, HTTPException
-from web_scraper.scrape_socials import scrapeSocials
+import asyncio
+import json
+
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from models.job import Job, JobRequest
-from config.db import connectDb
+from models.user import User
+from models.evaluation_task import EvaluationRun, EvaluationRequest
+from evaluation.queue import enqueue_evaluation, run_status
+from evaluation.ranking import candidate_rows, rank_candidates
+from config.context import context
+from config.db import run_db
 from bson import ObjectId
 from bson.errors import InvalidId
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The DB connects on first use (see config.context); APP_WARMUP connects here instead.
+    await asyncio.get_running_loop().run_in_executor(None, context.startup)
+    yield
+    context.close()
+
 
-# Connect to database
-connectDb()
+app = FastAPI(lifespan=lifespan)
 
 
 @app.get("/")
@@ -20,7 +36,7 @@ async def root():
 async def root_2(job: JobRequest):
     try:
         j = Job(jd_url=job.jd_url, hr_id=job.hr_id)
-        j.save()
+        await j.asave()
         return {
             "success": True
         }
@@ -38,7 +54,7 @@ async def get_job(job_id: str):
                 status_code=400, detail="Invalid job ID format")
 
         # Query the job by ID
-        job = Job.objects(id=job_id).first()  # type: ignore
+        job = await Job.afirst(id=job_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
 
@@ -50,3 +66,95 @@ async def get_job(job_id: str):
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.post("/job/{job_id}/evaluations", status_code=202)
+async def submit_evaluation(job_id: str, request: EvaluationRequest):
+    """Queue an evaluation of the given candidates; workers pick it up."""
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    if not request.candidate_ids or not all(ObjectId.is_valid(c) for c in request.candidate_ids):
+        raise HTTPException(status_code=400, detail="Invalid candidate ID format")
+
+    try:
+        job = await Job.afirst(id=job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        users = await run_db(lambda: list(User.objects(id__in=request.candidate_ids)))  # type: ignore
+        missing = set(request.candidate_ids) - {str(u.id) for u in users}
+        if missing:
+            raise HTTPException(
+                status_code=404, detail=f"Candidates not found: {sorted(missing)}")
+
+        run = await run_db(enqueue_evaluation, job, users, force=request.force)
+        return {
+            "success": True,
+            "run_id": str(run.id),
+            "status_url": f"/evaluations/{run.id}",
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.get("/job/{job_id}/candidates")
+async def get_candidates(job_id: str, limit: int = Query(20, ge=1, le=100),
+                         min_score: Optional[float] = None,
+                         no_gap: List[str] = Query(default=[]),
+                         cursor: Optional[str] = None):
+    """Candidates ranked by overall score, paginated with ``next_cursor``.
+
+    ``no_gap`` (repeatable) excludes candidates with a gap in that required skill.
+    """
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+    job = await Job.afirst(id=job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    def page():
+        rows, next_cursor = rank_candidates(job, limit, min_score, no_gap, cursor)
+        return {"candidates": candidate_rows(rows), "next_cursor": next_cursor}
+
+    try:
+        return await run_db(page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _get_run(run_id: str) -> EvaluationRun:
+    if not ObjectId.is_valid(run_id):
+        raise HTTPException(status_code=400, detail="Invalid run ID format")
+    run = await EvaluationRun.afirst(id=run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Evaluation run not found")
+    return run
+
+
+@app.get("/evaluations/{run_id}")
+async def get_evaluation(run_id: str):
+    run = await _get_run(run_id)
+    return await run_db(run_status, run)
+
+
+@app.get("/evaluations/{run_id}/stream")
+async def stream_evaluation(run_id: str, interval: float = 2.0):
+    """Server-sent events with the run status, sent whenever it changes."""
+    run = await _get_run(run_id)
+
+    async def events():
+        last = None
+        while True:
+            status = await run_db(run_status, run)
+            payload = json.dumps(status, default=str)
+            if payload != last:
+                yield f"data: {payload}\n\n"
+                last = payload
+            if status["status"] in ("done", "failed"):
+                break
+            await asyncio.sleep(max(interval, 0.5))
+
+    return StreamingResponse(events(), media_type="text/event-stream")
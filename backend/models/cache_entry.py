@@ -0,0 +1,23 @@
+from mongoengine import (
+    Document,
+    StringField,
+    DynamicField,
+    DateTimeField,
+)
+
+
+class CacheEntry(Document):
+    """A cached tool response. Mongo removes it once ``expires_at`` passes."""
+
+    namespace = StringField(required=True)
+    key = StringField(required=True)
+    value = DynamicField()
+    expires_at = DateTimeField(required=True)
+
+    meta = {
+        "collection": "cache_entries",
+        "indexes": [
+            {"fields": ["namespace", "key"], "unique": True},
+            {"fields": ["expires_at"], "expireAfterSeconds": 0},
+        ],
+    }
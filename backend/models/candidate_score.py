@@ -0,0 +1,45 @@
+from mongoengine import (
+    Document,
+    FloatField,
+    ListField,
+    StringField,
+    DictField,
+    DateTimeField,
+    ReferenceField,
+)
+
+from config.db import AsyncDocumentMixin
+from models.evaluation_task import utcnow
+from models.job import Job
+from models.user import User
+
+
+class CandidateScore(AsyncDocumentMixin, Document):
+    """Denormalized ranking row: one per (job, candidate), rebuilt from its ``Evaluation``s.
+
+    Shortlist queries ("top 20 for job X above 70 without a gap in Angular")
+    are answered from this collection and its indexes alone.
+    """
+
+    job = ReferenceField(Job, required=True)
+    user = ReferenceField(User, required=True)
+    overall = FloatField()
+    github_score = FloatField()
+    leetcode_score = FloatField()
+    linkedin_score = FloatField()
+    x_score = FloatField()
+    # Skill keys (see evaluation.ranking.skill_key) of required skills the
+    # candidate fell short on.
+    required_gaps = ListField(StringField())
+    evaluation_ids = DictField()
+    updated_at = DateTimeField(default=utcnow)
+
+    meta = {
+        "collection": "candidate_scores",
+        "indexes": [
+            {"fields": ["job", "user"], "unique": True},
+            ("job", "-overall", "_id"),
+            ("job", "required_gaps", "-overall"),
+            ("user", "-updated_at"),
+        ],
+    }
@@ -0,0 +1,139 @@
+import re
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from mongoengine import (
+    Document,
+    StringField,
+    FloatField,
+    DictField,
+    BinaryField,
+    DateTimeField,
+    ReferenceField,
+)
+
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from config.db import AsyncDocumentMixin
+from models.job import Job
+from models.user import User
+
+
+def parse_score(value: Any) -> Optional[float]:
+    """Coerce the score formats the LLM produces (9, "9", "9/10", "85%", "N/A")."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r"-?\d+(?:\.\d+)?", str(value))
+    return float(match.group()) if match else None
+
+
+def scale_score(value: Any) -> Optional[float]:
+    """``parse_score`` with fractions and percentages put on a 0-10 scale
+    ("7/10" -> 7, "70/100" -> 7, "85%" -> 8.5). Plain numbers are kept as is."""
+    score = parse_score(value)
+    if score is None or not isinstance(value, str):
+        return score
+    if "/" in value:
+        try:
+            denominator = float(value.split("/", 1)[1].split()[0])
+        except (ValueError, IndexError):
+            denominator = 10.0
+        if denominator > 0:
+            score = score * 10.0 / denominator
+    elif "%" in value:
+        score = score / 10.0
+    return score
+
+
+def _as_list(value: Any) -> list[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(v) for v in value]
+
+
+class CriterionResult(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    score: float = Field(ge=0, le=10)
+    explanation: str = Field(default="", validation_alias=AliasChoices("explanation", "evidence"))
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def _parse_score(cls, v):
+        return scale_score(v)
+
+
+class EvaluationResult(BaseModel):
+    """The final JSON ``evaluate_platform`` asks for (see web_scraper.evaluate_platforms).
+
+    Every criterion needs a 0-10 score; a payload without any scored
+    criterion is rejected rather than stored as an empty result. Criteria may
+    also come as a list of rows named by ``name`` or ``criterion``
+    (``examples/y.json``), and scores as "8/10" or "80%".
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+    platform: str
+    url: str = ""
+    criteria: dict[str, CriterionResult] = Field(min_length=1)
+    notes: list[str] = Field(default_factory=list)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _criteria_rows(cls, data):
+        criteria = data.get("criteria") if isinstance(data, dict) else None
+        if isinstance(criteria, list):
+            rows = {}
+            for row in criteria:
+                name = isinstance(row, dict) and (row.get("name") or row.get("criterion"))
+                if name:
+                    rows[str(name)] = row
+            data = {**data, "criteria": rows}
+        return data
+
+    @field_validator("notes", mode="before")
+    @classmethod
+    def _parse_notes(cls, v):
+        return _as_list(v)
+
+    @property
+    def score(self) -> float:
+        """Mean of the criterion scores the model reported (0-10)."""
+        return sum(c.score for c in self.criteria.values()) / len(self.criteria)
+
+
+class Evaluation(AsyncDocumentMixin, Document):
+    """Compact, queryable outcome of one platform evaluation of a candidate for a job."""
+
+    job = ReferenceField(Job, required=True)
+    user = ReferenceField(User, required=True)
+    platform = StringField(required=True)
+    plan_run_id = StringField()
+    state = StringField()
+    score = FloatField()
+    # 0-100 overall match computed by evaluation.scoring (``score`` is the mean
+    # 0-10 criterion score the model reported) and the canonical result (evaluation.normalize), so
+    # ranking queries never have to parse model-specific result shapes.
+    overall_percentage = FloatField()
+    normalized = DictField()
+    result = DictField()
+    error = StringField()
+    # Profile (and JD) fingerprint at evaluation time, see evaluation.fingerprints.
+    fingerprint = StringField()
+    # zlib-compressed PlanRun JSON, only stored when explicitly requested.
+    raw_run = BinaryField()
+    created_at = DateTimeField(default=lambda: datetime.now(timezone.utc))
+
+    meta = {
+        "collection": "evaluations",
+        "indexes": [
+            ("job", "user", "platform", "-created_at"),
+            ("job", "platform", "-overall_percentage"),
+            "user",
+        ],
+    }
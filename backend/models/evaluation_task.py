@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+
+from mongoengine import (
+    Document,
+    StringField,
+    IntField,
+    BooleanField,
+    ListField,
+    DictField,
+    DateTimeField,
+    ReferenceField,
+)
+
+from pydantic import BaseModel
+
+from config.db import AsyncDocumentMixin
+from models.job import Job
+from models.user import User
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class EvaluationRun(AsyncDocumentMixin, Document):
+    """One submission: a job evaluated against a set of candidates."""
+
+    job = ReferenceField(Job, required=True)
+    candidate_ids = ListField(StringField())
+    created_at = DateTimeField(default=utcnow)
+
+    meta = {"collection": "evaluation_runs", "indexes": ["job"]}
+
+
+class EvaluationTask(AsyncDocumentMixin, Document):
+    """Queue item evaluating one candidate of an ``EvaluationRun``.
+
+    Workers claim tasks atomically by flipping ``status`` from ``queued`` to
+    ``running`` and taking a lease. A task whose lease expires (worker crashed
+    or was killed) becomes claimable again.
+    """
+
+    run = ReferenceField(EvaluationRun, required=True)
+    job = ReferenceField(Job, required=True)
+    user = ReferenceField(User, required=True)
+    status = StringField(default="queued",
+                         choices=("queued", "running", "done", "failed"))
+    attempts = IntField(default=0)
+    max_attempts = IntField(default=3)
+    # Re-run every platform even if its profile fingerprint is unchanged.
+    force = BooleanField(default=False)
+    worker_id = StringField()
+    lease_until = DateTimeField()
+    result = DictField()
+    error = StringField()
+    created_at = DateTimeField(default=utcnow)
+    updated_at = DateTimeField(default=utcnow)
+
+    meta = {
+        "collection": "evaluation_tasks",
+        "indexes": [
+            ("status", "lease_until"),
+            ("status", "created_at"),
+            "run",
+        ],
+    }
+
+
+class EvaluationRequest(BaseModel):
+    candidate_ids: list[str]
+    force: bool = False
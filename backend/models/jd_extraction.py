@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+
+from mongoengine import (
+    Document,
+    StringField,
+    DictField,
+    DateTimeField,
+)
+
+from pydantic import BaseModel, Field
+
+
+class JdExtraction(Document):
+    """Cached text and criteria extracted from a single version of a JD PDF."""
+
+    jd_url = StringField(required=True)
+    content_hash = StringField(required=True)
+    etag = StringField()
+    last_modified = StringField()
+    text = StringField(default="")
+    criteria_summary = DictField()
+    created_at = DateTimeField(default=lambda: datetime.now(timezone.utc))
+
+    meta = {
+        "collection": "jd_extractions",
+        "indexes": [
+            {"fields": ["jd_url", "content_hash"], "unique": True},
+        ],
+    }
+
+
+class KeyRequirements(BaseModel):
+    required_skills: list[str] = Field(default_factory=list)
+    preferred_skills: list[str] = Field(default_factory=list)
+    experience_level: str = ""
+    project_requirements: str = ""
+
+
+class TechnicalRequirements(BaseModel):
+    programming_languages: list[str] = Field(default_factory=list)
+    algorithmic_concepts: list[str] = Field(default_factory=list)
+    problem_complexity: str = ""
+    technical_domains: list[str] = Field(default_factory=list)
+
+
+class JdCriteriaSummary(BaseModel):
+    """Structured criteria pulled out of a JD, shared by every evaluator prompt."""
+
+    title: str = ""
+    key_requirements: KeyRequirements = Field(default_factory=KeyRequirements)
+    technical_requirements: TechnicalRequirements = Field(
+        default_factory=TechnicalRequirements)
+    responsibilities: list[str] = Field(default_factory=list)
+    role_context: str = ""
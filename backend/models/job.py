@@ -10,8 +10,10 @@ from mongoengine import (
 
 from pydantic import BaseModel
 
+from config.db import AsyncDocumentMixin
 
-class Job(Document):
+
+class Job(AsyncDocumentMixin, Document):
     jd_url = StringField()
     hr_id = StringField()
 
@@ -0,0 +1,32 @@
+from mongoengine import (
+    Document,
+    StringField,
+    IntField,
+    BinaryField,
+    DateTimeField,
+)
+
+from models.evaluation_task import utcnow
+
+
+class PlanCheckpoint(Document):
+    """The last completed step of an unfinished plan run (see evaluation.checkpoints).
+
+    ``plan_run`` is the zlib-compressed plan run JSON with every step output so
+    far, set to resume at ``next_step``. Mongo removes it once ``expires_at`` passes.
+    """
+
+    key = StringField(required=True, unique=True)
+    plan_id = StringField(required=True)
+    plan_run_id = StringField(required=True)
+    next_step = IntField(default=0)
+    plan_run = BinaryField(required=True)
+    updated_at = DateTimeField(default=utcnow)
+    expires_at = DateTimeField(required=True)
+
+    meta = {
+        "collection": "plan_checkpoints",
+        "indexes": [
+            {"fields": ["expires_at"], "expireAfterSeconds": 0},
+        ],
+    }
@@ -8,15 +8,19 @@ from mongoengine import (
     EmbeddedDocumentField,
 )
 
+from config.db import AsyncDocumentMixin
+
 
 class Socials(EmbeddedDocument):
     githubUrl = StringField(default="")
     linkedInUrl = StringField(default="")
     leetcodeUrl = StringField(default="")
     xUrl = StringField(default="")
+    # Platforms link discovery (scrapeSocials) searched without finding a profile.
+    notFound = ListField(StringField(), default=list)
 
 
-class User(Document):
+class User(AsyncDocumentMixin, Document):
     name = StringField(required=True)
     email = EmailField()
     socials = EmbeddedDocumentField(Socials, default=Socials)
@@ -1,49 +1,20 @@
 from tools.pdf_reader import PdfToMarkdownTool
-from portia.open_source_tools.search_tool import SearchTool
-from portia.open_source_tools.crawl_tool import CrawlTool
+from tools.web_cache import CachedCrawlTool, CachedSearchTool
 from portia import DefaultToolRegistry, McpToolRegistry, Portia, Config, ToolRegistry
 
+import json
 import os
 from portia import Portia
 from web_scraper.scrape_socials import scrapeSocials
 from web_scraper.evaluate_platforms import evaluate_platform
 from models.user import User
-from config.db import connectDb
+from evaluation.jd_cache import get_jd_prompt_block
 from dotenv import load_dotenv
-from config.portia import config
+from config.context import context
+from evaluation.results import extract_final_json
 load_dotenv()
 
 
-my_tool_registry = ToolRegistry([
-    PdfToMarkdownTool(),
-    SearchTool(),
-    CrawlTool()
-])
-
-github_pat: str | None = os.getenv('GITHUB_PAT')
-
-if (github_pat is None):
-    exit()
-
-tool_registry = my_tool_registry + DefaultToolRegistry(config) + McpToolRegistry.from_stdio_connection(
-    server_name="github",
-    command="docker",
-    args=[
-        "run",
-        "-i",
-        "--rm",
-        "-e",
-        "GITHUB_PERSONAL_ACCESS_TOKEN",
-        "ghcr.io/github/github-mcp-server",
-    ],
-    env={"GITHUB_PERSONAL_ACCESS_TOKEN": github_pat},
-)
-
-portia = Portia(
-    config=config,
-    tools=tool_registry,
-)
-
 jd_text = "https://pub-eb4327f5bd25419da66fc17aa5ca024d.r2.dev/SD%20Intern%20JD.pdf"
 github_link = "https://github.com/shivambajpai04"
 linkedin_link = "https://www.linkedin.com/in/shivambajpai04"  # Add LinkedIn profile
@@ -54,7 +25,7 @@ prompt = """
 Use tools as needed to retrieve data from the provided links before analysis. Always call tools first if you don't have the content already.
 
 ### Task Instructions:
-1. Use the tools to fetch and extract the key criteria from the JD at {https://pub-eb4327f5bd25419da66fc17aa5ca024d.r2.dev/SD%20Intern%20JD.pdf}. Focus on:
+1. The JD has already been fetched and its key criteria extracted (see "Pre-extracted JD Criteria" at the end of these instructions). Do not fetch the JD again; use them as the key criteria from the JD. Focus on:
    - Required skills, technologies, and tools.
    - Experience levels (e.g., years of experience, project types).
    - Responsibilities and qualifications.
@@ -262,7 +233,27 @@ Ensure your analysis is thorough, evidence-based, and provides actionable insigh
 Be objective, evidence-based, and comprehensive. If links are invalid or content can't be fetched, note that and proceed with available information.
 """
 
-plan = portia.plan(prompt)
-print(plan.pretty_print())  # Optional: For debugging
-plan_run = portia.run_plan(plan)
-print(plan_run.model_dump_json(indent=2))  # Optional: For debugging
+
+def main():
+    if os.getenv('GITHUB_PAT') is None:
+        exit()
+
+    # Config, tool registries (including the GitHub MCP server) and the DB
+    # connection are only set up when the script runs, not on import.
+    portia = Portia(
+        config=context.config(),
+        tools=context.tool_registry([PdfToMarkdownTool(), CachedSearchTool(), CachedCrawlTool()]),
+    )
+    context.db()
+    jd_block = get_jd_prompt_block(jd_text)
+
+    full_prompt = prompt + "\n### Pre-extracted JD Criteria\n" + jd_block
+
+    plan = portia.plan(full_prompt)
+    print(plan.pretty_print())  # Optional: For debugging
+    plan_run = portia.run_plan(plan)
+    print(json.dumps(extract_final_json(plan_run), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("portia")
+
+from evaluation import batch
+
+OK = {"state": "COMPLETE", "final_output": {}, "error": None}
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(batch, "_provider_semaphores", {})
+    monkeypatch.setattr(batch, "get_jd_extraction", lambda url: None)
+
+
+def users(n):
+    return [SimpleNamespace(id=i, socials=SimpleNamespace(
+        githubUrl=f"https://github.com/u{i}", leetcodeUrl=f"https://leetcode.com/u/u{i}",
+        linkedInUrl="", xUrl="")) for i in range(n)]
+
+
+class FakeEvaluator:
+    def __init__(self, seconds=0.05, outcomes=None):
+        self.seconds, self.outcomes = seconds, outcomes or {}
+        self.lock = threading.Lock()
+        self.active, self.peak, self.calls = {}, {}, {}
+
+    def __call__(self, user_id, platform, data, jd_url=None, keep_raw=False):
+        with self.lock:
+            self.active[platform] = self.active.get(platform, 0) + 1
+            self.peak[platform] = max(self.peak.get(platform, 0), self.active[platform])
+            self.calls.setdefault((user_id, platform), []).append(time.monotonic())
+            attempt = len(self.calls[(user_id, platform)])
+        time.sleep(self.seconds)
+        with self.lock:
+            self.active[platform] -= 1
+        outcome = self.outcomes.get((user_id, platform), [])
+        outcome = outcome[attempt - 1] if attempt <= len(outcome) else OK
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def run(evaluator, n=6, **kwargs):
+    kwargs.setdefault("on_progress", lambda progress, task: None)
+    return batch.evaluate_candidates("https://example.com/jd.pdf", users(n), evaluator=evaluator,
+                                     max_workers=8, **kwargs)
+
+
+def test_provider_limits_cap_concurrency_per_platform():
+    evaluator = FakeEvaluator()
+    results = run(evaluator, provider_limits={"github": 3, "leetcode": 1})
+    assert evaluator.peak == {"github": 3, "leetcode": 1}
+    assert all(t.status == "done" for tasks in results.values() for t in tasks.values())
+
+
+def test_retries_wait_for_the_backoff():
+    failed_run = {"state": "FAILED", "error": "rate limited"}
+    evaluator = FakeEvaluator(seconds=0.0, outcomes={("0", "github"): [failed_run, RuntimeError("boom")]})
+    results = run(evaluator, n=1, backoff_seconds=0.1)
+    first, second, third = evaluator.calls[("0", "github")]
+    assert second - first >= 0.1
+    assert third - second >= 0.2
+    task = results["0"]["github"]
+    assert (task.status, task.attempts, task.error) == ("done", 3, None)
+
+
+def test_failures_are_isolated():
+    evaluator = FakeEvaluator(seconds=0.0, outcomes={("1", "leetcode"): [RuntimeError("boom")] * 3})
+    results = run(evaluator, n=3, max_retries=2, backoff_seconds=0.01)
+    failed = [(u, p) for u, tasks in results.items() for p, t in tasks.items() if t.status == "failed"]
+    assert failed == [("1", "leetcode")]
+    assert results["1"]["leetcode"].error == "boom"
+    assert sum(len(tasks) for tasks in results.values()) == 6
+
+
+def test_provider_limit_is_shared_across_calls():
+    first = batch.provider_semaphore("github", 2)
+    assert batch.provider_semaphore("github", 5) is first
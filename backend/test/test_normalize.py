@@ -0,0 +1,39 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from evaluation.normalize import normalize_evaluation
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.mark.parametrize("sample, shape, percentage", [
+    ("examples/i.json", "evaluation_table", 65.0),
+    ("examples/k.json", "evaluation", 76.0),
+    ("examples/l.json", "alignment_scores", 58.0),
+    ("examples/y.json", "criteria", 80.0),
+    ("other_samples/n.json", "evaluation_table", 71.25),
+    ("other_samples/w.json", "evaluation_table", 45.0),
+    ("other_samples/y.json", "evaluation_table", 75.0),
+    ("other_samples/z.json", "criteria_analysis", 64.0),
+    ("l.json", "top_level", 60.0),
+    ("m.json", "evaluation_table", 64.5),
+])
+def test_samples_normalize_to_percentage(sample, shape, percentage):
+    result = normalize_evaluation(json.loads((ROOT / sample).read_text()))
+
+    assert result.source_shape == shape
+    assert result.overall_percentage == pytest.approx(percentage)
+    assert result.criteria
+    assert all(c.score is None or 0 <= c.score <= 10 for c in result.criteria)
+
+
+def test_score_strings_are_rescaled():
+    result = normalize_evaluation({
+        "criteria": {"Commits": {"score": "7/10"}, "Stars": {"score": "40/100"}},
+        "overall_score": "71.5%",
+    })
+
+    assert [c.score for c in result.criteria] == [7.0, 4.0]
+    assert result.overall_percentage == 71.5
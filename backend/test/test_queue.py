@@ -0,0 +1,61 @@
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+import mongoengine
+
+from evaluation.queue import claim_task, enqueue_evaluation, fail_task, renew_lease
+from models.evaluation_task import EvaluationTask
+from models.job import Job
+from models.user import User
+
+
+@pytest.fixture(autouse=True)
+def db():
+    mongoengine.connect("test_queue", host="mongodb://localhost", alias="default",
+                        uuidRepresentation="standard", mongo_client_class=mongomock.MongoClient)
+    yield
+    mongoengine.disconnect(alias="default")
+
+
+def enqueue(max_attempts=2):
+    job = Job(jd_url="https://example.com/jd.pdf", hr_id="hr")
+    job.save()
+    user = User(name="n", email="a@example.com")
+    user.save()
+    enqueue_evaluation(job, [user], max_attempts=max_attempts)
+    return EvaluationTask.objects.get()
+
+
+def test_expired_lease_is_reclaimed_by_another_worker():
+    enqueue()
+    first = claim_task("w1", lease_seconds=-1)  # leased, then the worker died
+    second = claim_task("w2")
+    assert second.id == first.id
+    assert (second.worker_id, second.attempts) == ("w2", 2)
+    assert not renew_lease(first, "w1")
+    assert renew_lease(second, "w2")
+
+
+def test_live_lease_is_not_reclaimed():
+    enqueue()
+    assert claim_task("w1") is not None
+    assert claim_task("w2") is None
+
+
+def test_expired_lease_at_the_attempt_cap_fails_the_task():
+    enqueue(max_attempts=2)
+    claim_task("w1", lease_seconds=-1)
+    claim_task("w2", lease_seconds=-1)
+    assert claim_task("w3") is None
+    task = EvaluationTask.objects.get()
+    assert (task.status, task.attempts) == ("failed", 2)
+    assert "lease expired" in task.error
+
+
+def test_failed_attempts_are_requeued_until_the_cap():
+    enqueue(max_attempts=2)
+    fail_task(claim_task("w1"), "boom")
+    assert EvaluationTask.objects.get().status == "queued"
+    fail_task(claim_task("w1"), "boom")
+    assert EvaluationTask.objects.get().status == "failed"
+    assert claim_task("w1") is None
@@ -0,0 +1,32 @@
+from evaluation.normalize import NormalizedCriterion, NormalizedEvaluation
+from evaluation.ranking import covers, required_gaps
+
+
+def evaluation(*criteria):
+    return NormalizedEvaluation(criteria=[NormalizedCriterion(criterion=name, score=score)
+                                          for name, score in criteria])
+
+
+GITHUB = evaluation(("Commits", 9), ("Code Quality", 3), ("Recent Work Consistency", 8))
+
+
+def test_short_skills_do_not_match_inside_words():
+    assert required_gaps([GITHUB], ["C", "Go", "R", "Rust"]) == []
+
+
+def test_prefix_of_another_skill_is_not_a_match():
+    result = evaluation(("Java", 1), ("JavaScript / React", 9))
+    assert required_gaps([result], ["Java"]) == ["java"]
+    assert required_gaps([result], ["JavaScript"]) == []
+
+
+def test_whole_words_match_in_either_direction():
+    result = evaluation(("Python programming", 3), ("C++ / STL", 2), ("Data Structures and Algorithms", 8))
+    assert required_gaps([result], ["Python", "C++", "data structures", "C"]) == ["c++", "python"]
+
+
+def test_covers():
+    assert covers("node_js experience", "Node JS")
+    assert covers("C#", "c#")
+    assert not covers("Code Quality", "C")
+    assert not covers("Go", "Google Cloud")
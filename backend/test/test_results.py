@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from evaluation.results import validate_result
+
+ROOT = Path(__file__).resolve().parents[2]
+
+PLATFORM_OUTPUT = {
+    "platform": "github",
+    "url": "https://github.com/someone",
+    "criteria": {
+        "commits": {"score": 8, "explanation": "~900 commits"},
+        "code_quality": {"score": "6/10", "explanation": "few stars"},
+        "recent_work_consistency": {"score": 7.0, "explanation": "weekly"},
+    },
+    "notes": "Private repos not visible",
+}
+
+
+def test_platform_output_validates():
+    result, error = validate_result(PLATFORM_OUTPUT)
+    assert error is None
+    assert result.criteria["code_quality"].score == 6.0
+    assert result.notes == ["Private repos not visible"]
+    assert result.score == pytest.approx(7.0)
+
+
+def test_list_form_criteria_validate():
+    data = json.loads((ROOT / "examples/y.json").read_text())
+    result, error = validate_result(data)
+    assert error is None
+    assert result.criteria["Code Quality"].score == 5.0
+    assert result.score == pytest.approx(8.0)
+
+
+def test_fraction_and_percentage_scores_are_rescaled():
+    result, _ = validate_result({"platform": "x", "criteria": [
+        {"criterion": "Reach", "score": "70/100", "evidence": "7k followers"},
+        {"criterion": "Consistency", "score": "85%"},
+    ]})
+    assert result.criteria["Reach"].score == pytest.approx(7.0)
+    assert result.criteria["Reach"].explanation == "7k followers"
+    assert result.criteria["Consistency"].score == pytest.approx(8.5)
+
+
+@pytest.mark.parametrize("data", [
+    None,
+    {},
+    {"platform": "github", "criteria": {}},
+    {"platform": "github", "criteria": [{"score": 7}]},
+    {"platform": "github", "criteria": {"commits": {"score": "N/A"}}},
+    {"platform": "github", "criteria": {"commits": {"score": 42}}},
+    {"evaluation_table": [], "overall_match": {"percentage": 70}, "score": 70},
+])
+def test_incomplete_outputs_are_rejected(data):
+    result, error = validate_result(data)
+    assert result is None and error
@@ -0,0 +1,42 @@
+import pytest
+
+from evaluation.normalize import NormalizedCriterion, NormalizedEvaluation
+from evaluation.scoring import combine_platform_scores, score_evaluation, score_evaluations
+
+
+def _evaluation(platform=None, *rows):
+    return NormalizedEvaluation(platform=platform, criteria=[
+        NormalizedCriterion(criterion=name, requirement_type=kind, score=score)
+        for name, kind, score in rows
+    ])
+
+
+def test_tiers_are_weighted_70_20_10():
+    evaluation = _evaluation(None, ("a", "critical", 10), ("b", "important", 5), ("c", "preferred", 0))
+    assert score_evaluation(evaluation) == pytest.approx(80.0)
+
+
+def test_required_and_preferred_renormalize_over_present_tiers():
+    evaluation = _evaluation(None, ("a", "Required", 8), ("b", "preferred", 0), ("c", "preferred", None))
+    assert score_evaluation(evaluation) == pytest.approx(70.0)
+
+
+def test_criterion_weights_within_platform():
+    evaluation = _evaluation("github", ("commits", "", 10), ("code_quality", "", 0),
+                             ("Recent Work Consistency", "", 5))
+    assert score_evaluation(evaluation) == pytest.approx((10 + 0 + 5 * 0.4) / 1.6 * 10)
+
+
+def test_batch_keeps_unscored_evaluations_nan():
+    scores = score_evaluations([_evaluation(None, ("a", "", 6)), _evaluation(None)])
+    assert scores[0] == pytest.approx(60.0)
+    assert scores[1] != scores[1]
+
+
+def test_missing_platforms_are_not_counted_as_zero():
+    combined = combine_platform_scores({
+        "u1": {"github": 80.0, "leetcode": None},
+        "u2": {"github": 60.0, "leetcode": 90.0},
+        "u3": {},
+    }, {"github": 2.0})
+    assert combined == {"u1": 80.0, "u2": 70.0, "u3": None}
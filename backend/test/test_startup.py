@@ -0,0 +1,21 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_importing_the_api_initializes_nothing():
+    # A fresh interpreter, so nothing is imported or connected already.
+    probe = (
+        "import json, sys, main\n"
+        "from config.context import context\n"
+        "print(json.dumps({'portia': 'portia' in sys.modules, **context.initialized()}))"
+    )
+    proc = subprocess.run([sys.executable, "-c", probe], cwd=BACKEND_DIR,
+                          capture_output=True, text=True, env={**os.environ, "MONGO_URI": ""}, check=True)
+    state = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert state == {"portia": False, "db": False, "configs": [], "tool_registries": [],
+                     "github_mcp": False}
@@ -0,0 +1,37 @@
+"""HTTP session shared by the tools and by profile fingerprinting.
+
+One keep-alive connection pool per process, so consecutive calls to the
+same host skip the TCP+TLS handshake. 429 and 5xx responses to GETs are
+retried with backoff. No default headers are set; callers pass what they need.
+"""
+
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 10, retries: int = 3, backoff: float = 1.0) -> requests.Session:
+    """Return the shared session, retrying 429 and 5xx responses with backoff."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=retries,
+                backoff_factor=backoff,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET",),
+                respect_retry_after_header=True,
+            )
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                  max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
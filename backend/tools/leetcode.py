@@ -2,11 +2,32 @@ from __future__ import annotations
 
 """Custom Portia tool: Interact with the alfa-leetcode-api to get LeetCode user profile and skill statistics."""
 
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional, Dict
 import requests
 from pydantic import BaseModel, Field, validator
 
 from portia.tool import Tool, ToolRunContext, ToolHardError
+from tools.trimming import TOOL_OUTPUT_TOKEN_BUDGET, trim_tool_output
+from tools.http import get_session
+from tools.ttl_cache import TTLCache, backend_from_env
+
+
+# Responses are cached per endpoint, so evaluating the same username against
+# several JDs in a hiring cycle costs no network round-trips after the first.
+response_cache = TTLCache(
+    maxsize=int(os.getenv("LEETCODE_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("LEETCODE_CACHE_TTL", str(6 * 3600))),
+    backend=backend_from_env("LEETCODE", "leetcode"),
+)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the LeetCode response cache."""
+    return response_cache.stats()
 
 
 class LeetCodeAPISchema(BaseModel):
@@ -17,7 +38,8 @@ class LeetCodeAPISchema(BaseModel):
         description=(
             "The action to perform. Available actions: "
             "'user_profile' - Get complete user profile data, "
-            "'skill_stats' - Get user's skill-based statistics"
+            "'skill_stats' - Get user's skill-based statistics, "
+            "'full_profile' - Get a trimmed profile and skill statistics in one call (preferred)"
         )
     )
 
@@ -28,7 +50,7 @@ class LeetCodeAPISchema(BaseModel):
 
     @validator('action')
     def validate_action(cls, v):
-        valid_actions = {'user_profile', 'skill_stats'}
+        valid_actions = {'user_profile', 'skill_stats', 'full_profile'}
         if v not in valid_actions:
             raise ValueError(
                 f"Invalid action. Must be one of: {valid_actions}")
@@ -48,20 +70,42 @@ class LeetCodeAPITool(Tool[Dict[str, Any]]):
     args_schema: type[BaseModel] = LeetCodeAPISchema
     output_schema: tuple[str, str] = (
         "Dict[str, Any]", "JSON response from the LeetCode API")
+    # The free-tier host can take a while to cold start; never wait forever.
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0
+    use_cache: bool = True
+    # Raw responses (e.g. the per-day submission calendar) are trimmed to this.
+    max_output_tokens: int = TOOL_OUTPUT_TOKEN_BUDGET
 
     def _make_request(self, endpoint: str) -> Dict[str, Any]:
-        """Make HTTP request to the API."""
+        """Make HTTP request to the API, answering from the response cache when possible."""
         url = f"{self.base_url}{endpoint}"
 
+        if self.use_cache:
+            cached = response_cache.get(url)
+            if cached is not None:
+                return dict(cached)
+
         try:
-            response = requests.get(url)
+            response = get_session().get(
+                url, headers={"Accept": "application/json"},
+                timeout=(self.connect_timeout, self.read_timeout))
             response.raise_for_status()
-            return response.json()
+            result = response.json()
         except requests.RequestException as e:
             raise ToolHardError(f"Failed to fetch data from LeetCode API: {e}")
         except ValueError as e:
             raise ToolHardError(f"Failed to parse JSON response: {e}")
 
+        if not isinstance(result, dict):
+            raise ToolHardError(f"Unexpected LeetCode API response: expected a JSON object, got {type(result).__name__}")
+        # GraphQL errors (unknown user, upstream rate limit) are not cached.
+        if result.get("errors"):
+            raise ToolHardError(f"LeetCode API returned errors: {result['errors']}")
+        if self.use_cache:
+            response_cache.set(url, result)
+        return dict(result)
+
     def _build_endpoint(self, action: str, username: str) -> str:
         """Build the API endpoint based on the action."""
         if action == 'user_profile':
@@ -71,15 +115,38 @@ class LeetCodeAPITool(Tool[Dict[str, Any]]):
         else:
             raise ToolHardError(f"Unknown action: {action}")
 
+    def user_profile(self, username: str) -> Dict[str, Any]:
+        """The raw ``user_profile`` response for ``username`` (untrimmed)."""
+        return self._make_request(self._build_endpoint('user_profile', username))
+
+    def _full_profile(self, username: str) -> Dict[str, Any]:
+        """Fetch profile and skill stats concurrently and merge them into one trimmed payload."""
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            profile = pool.submit(self._make_request, self._build_endpoint('user_profile', username))
+            skills = pool.submit(self._make_request, self._build_endpoint('skill_stats', username))
+            return merge_full_profile(profile.result(), skills.result())
+
     def run(self, context: ToolRunContext, action: str, username: str) -> Dict[str, Any]:
         """Execute the LeetCode API request."""
 
+        if action == 'full_profile':
+            try:
+                result = self._full_profile(username)
+            except Exception as e:
+                raise ToolHardError(f"Error executing LeetCode API request: {e}")
+            result['_metadata'] = {
+                'action': action,
+                'username': username,
+                'base_url': self.base_url
+            }
+            return result
+
         # Build endpoint
         endpoint = self._build_endpoint(action, username)
 
         # Make the request
         try:
-            result = self._make_request(endpoint)
+            result = trim_tool_output(self._make_request(endpoint), self.max_output_tokens)
 
             # Add metadata about the request
             result['_metadata'] = {
@@ -95,6 +162,75 @@ class LeetCodeAPITool(Tool[Dict[str, Any]]):
             raise ToolHardError(f"Error executing LeetCode API request: {e}")
 
 
+PROFILE_FIELDS = (
+    'totalSolved', 'totalQuestions',
+    'easySolved', 'totalEasy',
+    'mediumSolved', 'totalMedium',
+    'hardSolved', 'totalHard',
+    'ranking', 'contributionPoint', 'reputation',
+)
+RECENT_SUBMISSIONS_LIMIT = 10
+
+
+def _activity_summary(calendar: Any, days: int = 365) -> Dict[str, int]:
+    """Condense the per-day submission calendar into a few activity counts."""
+    if isinstance(calendar, str):
+        try:
+            calendar = json.loads(calendar)
+        except ValueError:
+            calendar = {}
+    if not isinstance(calendar, dict):
+        calendar = {}
+
+    cutoff = time.time() - days * 86400
+    recent = {int(ts): int(n) for ts, n in calendar.items()
+              if str(ts).isdigit() and int(ts) >= cutoff}
+    last_90 = time.time() - 90 * 86400
+    return {
+        'active_days_last_year': sum(1 for n in recent.values() if n > 0),
+        'submissions_last_year': sum(recent.values()),
+        'submissions_last_90_days': sum(n for ts, n in recent.items() if ts >= last_90),
+    }
+
+
+def _skill_summary(skill_stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten tagProblemCounts into {level: [{tag, solved}]} sorted by solved count."""
+    counts = (
+        skill_stats.get('data', {}).get('matchedUser', {}) or {}
+    ).get('tagProblemCounts', {}) or {}
+    return {
+        level: sorted(
+            ({'tag': t.get('tagName'), 'solved': t.get('problemsSolved', 0)} for t in tags or []),
+            key=lambda t: t['solved'], reverse=True,
+        )
+        for level, tags in counts.items()
+    }
+
+
+def merge_full_profile(profile: Dict[str, Any], skill_stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only what an evaluation needs from the two raw API responses.
+
+    The raw profile carries a day-by-day submission calendar and full
+    submission objects that are mostly noise for the LLM; they are reduced to
+    activity counts and the most recent accepted/attempted problems.
+    """
+    recent = [
+        {
+            'title': s.get('title'),
+            'status': s.get('statusDisplay'),
+            'lang': s.get('lang'),
+            'timestamp': s.get('timestamp'),
+        }
+        for s in (profile.get('recentSubmissions') or [])[:RECENT_SUBMISSIONS_LIMIT]
+    ]
+    return {
+        'profile': {k: profile.get(k) for k in PROFILE_FIELDS if k in profile},
+        'activity': _activity_summary(profile.get('submissionCalendar')),
+        'recent_submissions': recent,
+        'skills': _skill_summary(skill_stats),
+    }
+
+
 # Usage examples and helper functions
 def get_user_profile(context: ToolRunContext, username: str) -> Dict[str, Any]:
     """Helper function to get a user's complete profile."""
@@ -106,3 +242,9 @@ def get_skill_stats(context: ToolRunContext, username: str) -> Dict[str, Any]:
     """Helper function to get user's skill-based statistics."""
     tool = LeetCodeAPITool()
     return tool.run(context, action='skill_stats', username=username)
+
+
+def get_full_profile(context: ToolRunContext, username: str) -> Dict[str, Any]:
+    """Helper function to get a user's trimmed profile and skill statistics in one call."""
+    tool = LeetCodeAPITool()
+    return tool.run(context, action='full_profile', username=username)
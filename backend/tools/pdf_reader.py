@@ -2,9 +2,18 @@ from __future__ import annotations
 
 """Custom Portia tool: Fetch a PDF by URL and return its text content."""
 
-from io import BytesIO
+import multiprocessing
+import os
 import re
-from typing import Any
+import shutil
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from io import StringIO
+from tempfile import NamedTemporaryFile, SpooledTemporaryFile
+from typing import IO, Any, Dict, Iterator, Optional
 
 import requests
 from pydantic import BaseModel, Field
@@ -12,15 +21,56 @@ from pydantic import BaseModel, Field
 from portia.tool import Tool, ToolRunContext, ToolHardError
 
 try:
-	from pdfminer.high_level import extract_text  # type: ignore
+	from pdfminer.converter import TextConverter  # type: ignore
+	from pdfminer.layout import LAParams  # type: ignore
+	from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager  # type: ignore
+	from pdfminer.pdfpage import PDFPage  # type: ignore
 except Exception as e:  # pragma: no cover - surfaced as ToolHardError at runtime
-	extract_text = None  # fallback marker
+	PDFPage = None  # fallback marker
+
+
+# Hard cap on downloaded PDF size; larger documents are rejected mid-stream.
+MAX_PDF_BYTES = int(os.getenv("PDF_MAX_BYTES", str(20 * 1024 * 1024)))
+# PDFs up to this size stay in memory; larger ones spill to a temp file.
+SPOOL_MEMORY_BYTES = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+# Page limit for PdfToMarkdownTool; 0 (the default) reads the whole document.
+# Set it to bound parsing time, at the cost of truncating longer documents.
+DEFAULT_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "0"))
+# Size of the process pool used for extraction; 0 keeps parsing in-process.
+PDF_POOL_SIZE = int(os.getenv("PDF_POOL_SIZE", "0"))
+# Seconds a single extraction may take before it is abandoned.
+PDF_PARSE_TIMEOUT = float(os.getenv("PDF_PARSE_TIMEOUT", "60"))
+# Extra seconds before a worker that ignores its own timeout is killed.
+PDF_KILL_GRACE = 10.0
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class PdfExtractOptions(BaseModel):
+	"""How much of a PDF to parse and how much layout analysis to spend on it.
+
+	Layout analysis (``LAParams``) is the most expensive part of pdfminer.
+	``laparams`` overrides individual LAParams settings (e.g. ``boxes_flow=None``
+	skips reading-order analysis). ``layout=False`` skips layout analysis
+	entirely and emits characters in content-stream order; it is the fastest
+	mode, but PDFs that position words without explicit spaces come out glued
+	together.
+	"""
+
+	max_pages: Optional[int] = None
+	max_chars: Optional[int] = None
+	layout: bool = True
+	laparams: Dict[str, Any] = Field(default_factory=dict)
 
 
 class PdfToMarkdownToolSchema(BaseModel):
 	"""Inputs for PdfToMarkdownTool."""
 
 	url: str = Field(..., description="Public URL to a PDF file to read and return as plain text")
+	max_pages: Optional[int] = Field(
+		None, description="Only read the first N pages (default: the whole document, or PDF_MAX_PAGES if set)")
 
 
 class PdfToMarkdownTool(Tool[str]):
@@ -33,34 +83,203 @@ class PdfToMarkdownTool(Tool[str]):
 	)
 	args_schema: type[BaseModel] = PdfToMarkdownToolSchema
 	output_schema: tuple[str, str] = ("str", "Plain text extracted from the PDF")
+	max_bytes: int = MAX_PDF_BYTES
+	extract_options: PdfExtractOptions = Field(
+		default_factory=lambda: PdfExtractOptions(max_pages=DEFAULT_MAX_PAGES or None))
+	use_process_pool: bool = PDF_POOL_SIZE > 0
+	parse_timeout: float = PDF_PARSE_TIMEOUT
 
-	def run(self, _: ToolRunContext, url: str) -> str:
-		if extract_text is None:
-			raise ToolHardError(
-				"pdfminer.six is not available. Please install 'pdfminer.six' in the environment."
-			)
+	def run(self, _: ToolRunContext, url: str, max_pages: Optional[int] = None) -> str:
+		options = self.extract_options
+		if max_pages:
+			options = options.model_copy(update={"max_pages": max_pages})
+		with download_pdf(url, self.max_bytes) as fp:
+			if self.use_process_pool:
+				return pdf_file_to_text_offloaded(fp, options, self.parse_timeout)
+			return pdf_file_to_text(fp, options)
 
-		# Fetch PDF bytes
-		try:
-			resp = requests.get(url, timeout=(10, 60), stream=True)
-		except requests.RequestException as e:
-			raise ToolHardError(f"Failed to fetch PDF: {e}")
 
+def download_pdf(url: str, max_bytes: int = MAX_PDF_BYTES) -> IO[bytes]:
+	"""Stream a PDF into a size-limited spooled temp file, rewound to the start.
+
+	The download is aborted as soon as the body is known not to be a PDF or
+	grows past ``max_bytes``, so memory stays flat regardless of document size.
+	The caller owns (and should close) the returned file.
+	"""
+	try:
+		resp = requests.get(url, timeout=(10, 60), stream=True)
+	except requests.RequestException as e:
+		raise ToolHardError(f"Failed to fetch PDF: {e}")
+
+	with resp:
 		if resp.status_code != 200:
 			raise ToolHardError(f"Failed to fetch PDF: HTTP {resp.status_code}")
 
+		declared = resp.headers.get("Content-Length", "")
+		if declared.isdigit() and int(declared) > max_bytes:
+			raise ToolHardError(f"PDF is too large ({declared} bytes, limit {max_bytes}).")
+
 		content_type = resp.headers.get("Content-Type", "").lower()
-		# Some servers may not set header, so accept if header is OK or magic header matches
-		data = resp.content
-		if not ("application/pdf" in content_type or data[:5] == b"%PDF-"):
-			raise ToolHardError(
-				"URL did not return a PDF (unexpected content-type or header)."
-			)
-
-		# Extract text
+		spool = SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+		total = 0
+		head = b""
 		try:
-			text = extract_text(BytesIO(data)) or ""
-		except Exception as e:
-			raise ToolHardError(f"Failed to extract text from PDF: {e}")
-		return text.strip()
+			for chunk in resp.iter_content(CHUNK_SIZE):
+				if not chunk:
+					continue
+				if len(head) < 5:
+					head += chunk[:5 - len(head)]
+					# Some servers may not set header, so accept if header is OK or magic header matches
+					if len(head) >= 5 and not ("application/pdf" in content_type or head == b"%PDF-"):
+						raise ToolHardError(
+							"URL did not return a PDF (unexpected content-type or header)."
+						)
+				total += len(chunk)
+				if total > max_bytes:
+					raise ToolHardError(f"PDF exceeds the {max_bytes} byte limit.")
+				spool.write(chunk)
+		except requests.RequestException as e:
+			spool.close()
+			raise ToolHardError(f"Failed to fetch PDF: {e}")
+		except ToolHardError:
+			spool.close()
+			raise
+
+	if total == 0 or not ("application/pdf" in content_type or head == b"%PDF-"):
+		spool.close()
+		raise ToolHardError("URL did not return a PDF (unexpected content-type or header).")
+
+	spool.seek(0)
+	return spool
+
+
+def iter_pdf_pages(fp: IO[bytes], options: Optional[PdfExtractOptions] = None) -> Iterator[str]:
+	"""Yield the text of each page in turn so callers can stop once they have enough."""
+	if PDFPage is None:
+		raise ToolHardError(
+			"pdfminer.six is not available. Please install 'pdfminer.six' in the environment."
+		)
+
+	options = options or PdfExtractOptions()
+	laparams = LAParams(**options.laparams) if options.layout else None
+	rsrcmgr = PDFResourceManager(caching=True)
+	out = StringIO()
+	device = TextConverter(rsrcmgr, out, laparams=laparams)
+	interpreter = PDFPageInterpreter(rsrcmgr, device)
+	try:
+		for page in PDFPage.get_pages(fp, maxpages=options.max_pages or 0, caching=True):
+			interpreter.process_page(page)
+			yield out.getvalue()
+			out.seek(0)
+			out.truncate()
+	finally:
+		device.close()
+
+
+def pdf_file_to_text(fp: IO[bytes], options: Optional[PdfExtractOptions] = None) -> str:
+	"""Extract plain text from a seekable PDF file object.
+
+	Stops parsing at ``options.max_pages`` pages or once ``options.max_chars``
+	characters have been collected.
+	"""
+	options = options or PdfExtractOptions()
+	parts = []
+	total = 0
+	try:
+		for page_text in iter_pdf_pages(fp, options):
+			parts.append(page_text)
+			total += len(page_text)
+			if options.max_chars and total >= options.max_chars:
+				break
+	except (ToolHardError, TimeoutError):
+		raise
+	except Exception as e:
+		raise ToolHardError(f"Failed to extract text from PDF: {e}")
+
+	text = "".join(parts)
+	if options.max_chars:
+		text = text[:options.max_chars]
+	return text.strip()
+
+
+def _raise_timeout(signum, frame):
+	raise TimeoutError("PDF extraction timed out")
+
+
+def _extract_in_worker(path: str, options: Dict[str, Any], timeout: float) -> str:
+	"""Process-pool entry point. The timeout is enforced inside the worker, so
+	it counts from when the worker starts parsing, not from submission, and a
+	pathological PDF is interrupted without killing the worker process."""
+	has_timer = hasattr(signal, "setitimer")
+	if has_timer:
+		previous = signal.signal(signal.SIGALRM, _raise_timeout)
+		signal.setitimer(signal.ITIMER_REAL, timeout)
+	try:
+		with open(path, "rb") as fp:
+			return pdf_file_to_text(fp, PdfExtractOptions.model_validate(options))
+	finally:
+		if has_timer:
+			signal.setitimer(signal.ITIMER_REAL, 0)
+			signal.signal(signal.SIGALRM, previous)
+
+
+def get_pdf_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+	"""Return the shared extraction pool, creating it on first use.
+
+	Workers are spawned rather than forked: the calling process runs threads
+	(batch workers, pymongo monitors) whose locks a fork would copy mid-use.
+	"""
+	global _pool
+	with _pool_lock:
+		if _pool is None:
+			_pool = ProcessPoolExecutor(max_workers=max_workers or PDF_POOL_SIZE or os.cpu_count(),
+										mp_context=multiprocessing.get_context("spawn"))
+		return _pool
+
+
+def shutdown_pdf_pool(kill: bool = False) -> None:
+	"""Shut the pool down, cancelling queued work; ``kill`` also terminates busy workers."""
+	global _pool
+	with _pool_lock:
+		if _pool is not None:
+			if kill:
+				for process in list((_pool._processes or {}).values()):
+					process.terminate()
+			_pool.shutdown(wait=False, cancel_futures=True)
+			_pool = None
+
+
+def pdf_file_to_text_offloaded(fp: IO[bytes], options: Optional[PdfExtractOptions] = None,
+								timeout: float = PDF_PARSE_TIMEOUT) -> str:
+	"""Like ``pdf_file_to_text`` but parses in the shared process pool.
 
+	Keeps CPU-bound parsing off the GIL of the calling process, so a batch run
+	uses every core, and bounds the time any one document may take once a
+	worker has picked it up (time spent queued does not count). The document
+	is handed over as a temp file path, so it is never loaded into memory
+	whole. A worker that overruns its own timeout by ``PDF_KILL_GRACE`` is
+	killed and the pool recycled (other in-flight extractions then fail).
+	"""
+	options = options or PdfExtractOptions()
+	with NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+		shutil.copyfileobj(fp, tmp, CHUNK_SIZE)
+	try:
+		future = get_pdf_pool().submit(_extract_in_worker, tmp.name, options.model_dump(), timeout)
+		started = None
+		while not wait([future], timeout=0.1).done:
+			if not future.running():
+				continue
+			# "running" can include one call queued behind a busy worker.
+			started = started or time.monotonic()
+			if time.monotonic() - started > 2 * timeout + PDF_KILL_GRACE:
+				future.cancel()
+				shutdown_pdf_pool(kill=True)
+				raise ToolHardError(f"PDF extraction timed out after {timeout:g}s (worker killed)")
+		return future.result()
+	except TimeoutError:
+		raise ToolHardError(f"PDF extraction timed out after {timeout:g}s")
+	except BrokenProcessPool as e:
+		shutdown_pdf_pool()
+		raise ToolHardError(f"PDF extraction worker crashed: {e}")
+	finally:
+		os.unlink(tmp.name)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+"""Token estimates and tool output trimming.
+
+Tool outputs are trimmed before they reach the agent: noisy fields are
+dropped and long lists and strings are capped, since raw LeetCode JSON or a
+whole crawled page would otherwise be carried through every following step.
+Used by the tools themselves and by prompt assembly (see evaluation.prompts).
+
+Token counts are estimates (``CHARS_PER_TOKEN`` characters per token), close
+enough for budgeting and for following the trend between runs.
+"""
+
+import json
+import os
+import re
+from typing import Any
+
+CHARS_PER_TOKEN = 4
+# Upper bound for a single tool output handed to the agent.
+TOOL_OUTPUT_TOKEN_BUDGET = int(os.getenv("TOOL_OUTPUT_TOKEN_BUDGET", "4000"))
+
+# Fields that are large and carry nothing an evaluation uses.
+NOISY_KEYS = frozenset({
+    "submissionCalendar", "avatar", "avatar_url", "gravatar_id", "node_id",
+    "_links", "html", "raw_html", "images", "favicon", "headers",
+})
+MAX_STRING_CHARS = 2000
+MAX_LIST_ITEMS = 25
+
+_MARKDOWN_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def estimate_tokens(value: Any) -> int:
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    dropped = estimate_tokens(text[max_chars:])
+    return text[:max_chars] + f"\n[... truncated {dropped} tokens]"
+
+
+def compact_text(text: str) -> str:
+    """Strip markdown images and runs of blank lines/spaces from crawled text."""
+    text = _MARKDOWN_IMAGE.sub("", text)
+    text = "\n".join(" ".join(line.split()) for line in text.splitlines())
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def _prune(value: Any, max_items: int, max_chars: int) -> Any:
+    if isinstance(value, dict):
+        return {k: _prune(v, max_items, max_chars) for k, v in value.items() if k not in NOISY_KEYS}
+    if isinstance(value, list):
+        pruned = [_prune(v, max_items, max_chars) for v in value[:max_items]]
+        if len(value) > max_items:
+            pruned.append(f"[... {len(value) - max_items} more items]")
+        return pruned
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + "[...]"
+    return value
+
+
+def trim_tool_output(value: Any, max_tokens: int = TOOL_OUTPUT_TOKEN_BUDGET) -> Any:
+    """Shrink a tool output to roughly ``max_tokens``, keeping its type.
+
+    Strings are compacted and truncated. Dicts and lists lose ``NOISY_KEYS``
+    and get their lists and strings capped, more aggressively until they fit.
+    """
+    if isinstance(value, str):
+        return truncate_to_tokens(compact_text(value), max_tokens)
+    if not isinstance(value, (dict, list)):
+        return value
+
+    max_items, max_chars = MAX_LIST_ITEMS, MAX_STRING_CHARS
+    pruned = _prune(value, max_items, max_chars)
+    while estimate_tokens(pruned) > max_tokens and (max_items > 1 or max_chars > 200):
+        max_items, max_chars = max(1, max_items // 2), max(200, max_chars // 2)
+        pruned = _prune(value, max_items, max_chars)
+    return pruned
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+"""TTL + LRU cache for tool responses, with optional persistent backing stores.
+
+The in-memory layer is a size-bounded LRU; entries also expire after ``ttl``
+seconds. A backing store (on disk or in Mongo) makes entries survive process
+restarts and lets several worker processes share them: a miss in memory
+falls through to the store before the caller goes to the network.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from models.cache_entry import CacheEntry
+
+
+class CacheBackend(ABC):
+    """Persistent store behind a ``TTLCache``. Values must be JSON serializable."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        """Return ``(expires_at, value)`` or None."""
+
+    @abstractmethod
+    def set(self, key: str, expires_at: float, value: Any) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class DiskCacheBackend(CacheBackend):
+    """One JSON file per key; the oldest files are pruned past ``max_entries``."""
+
+    def __init__(self, directory: str | Path, max_entries: int = 10_000):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        try:
+            entry = json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        return entry["expires_at"], entry["value"]
+
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({"key": key, "expires_at": expires_at, "value": value}))
+        tmp.replace(path)
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._prune()
+
+    def _prune(self) -> None:
+        files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+class MongoCacheBackend(CacheBackend):
+    """Entries in the ``cache_entries`` collection, expired by a Mongo TTL index."""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = CacheEntry.objects(namespace=self.namespace, key=key).first()  # type: ignore
+        if entry is None:
+            return None
+        expires_at = entry.expires_at.replace(tzinfo=timezone.utc).timestamp()
+        return expires_at, entry.value
+
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        CacheEntry.objects(namespace=self.namespace, key=key).update_one(  # type: ignore
+            upsert=True,
+            set__value=value,
+            set__expires_at=datetime.fromtimestamp(expires_at, timezone.utc),
+        )
+
+    def delete(self, key: str) -> None:
+        CacheEntry.objects(namespace=self.namespace, key=key).delete()  # type: ignore
+
+    def clear(self) -> None:
+        CacheEntry.objects(namespace=self.namespace).delete()  # type: ignore
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600,
+                 backend: Optional[CacheBackend] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self._data: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._data[key]
+
+        if self.backend is not None:
+            try:
+                stored = self.backend.get(key)
+            except Exception:
+                stored = None
+            if stored is not None and stored[0] > now:
+                with self._lock:
+                    self._store(key, stored)
+                    self.hits += 1
+                    self.backend_hits += 1
+                return stored[1]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store(key, (expires_at, value))
+        if self.backend is not None:
+            try:
+                self.backend.set(key, expires_at, value)
+            except Exception as e:
+                print(f"Cache backend write failed: {e}")
+
+    def _store(self, key: str, entry: Tuple[float, Any]) -> None:
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+        if self.backend is not None:
+            self.backend.delete(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "backend_hits": self.backend_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def backend_from_env(prefix: str, namespace: str, default: str = "memory") -> Optional[CacheBackend]:
+    """Pick a backing store from ``{prefix}_CACHE_BACKEND`` (memory | disk | mongo)."""
+    kind = os.getenv(f"{prefix}_CACHE_BACKEND", default).lower()
+    if kind == "disk":
+        default_dir = Path(__file__).resolve().parent.parent / ".cache" / namespace
+        return DiskCacheBackend(os.getenv(f"{prefix}_CACHE_DIR", str(default_dir)))
+    if kind == "mongo":
+        return MongoCacheBackend(namespace)
+    return None
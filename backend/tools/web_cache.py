@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+"""Cached drop-in replacements for Portia's CrawlTool and SearchTool.
+
+Candidates of one hiring batch share portfolio hosts, GitHub pages and very
+similar search queries, and re-runs crawl the same pages again. Results are
+cached per tool call (keyed by the tool and its normalized arguments) in a
+TTL + LRU cache that is persisted on disk by default, so a page or query is
+fetched at most once per TTL across runs and worker restarts. Concurrent
+identical calls wait for the first one instead of fetching in parallel.
+Inside ``web_cache_refresh()`` calls skip the cached value and fetch again
+(storing the fresh result), for re-runs that must see the current pages.
+What the agent receives is trimmed to ``max_output_tokens`` (see
+``tools.trimming.trim_tool_output``); the cache keeps the full result.
+
+Settings: ``CRAWL_CACHE_TTL`` / ``CRAWL_CACHE_SIZE`` / ``CRAWL_CACHE_BACKEND``
+(memory | disk | mongo) / ``CRAWL_CACHE_DIR``, and the same with ``SEARCH_``.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from portia.open_source_tools.crawl_tool import CrawlTool
+from portia.open_source_tools.search_tool import SearchTool
+from portia.tool import ToolRunContext
+
+from tools.trimming import TOOL_OUTPUT_TOKEN_BUDGET, trim_tool_output
+from tools.ttl_cache import TTLCache, backend_from_env
+
+crawl_cache = TTLCache(
+    maxsize=int(os.getenv("CRAWL_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("CRAWL_CACHE_TTL", str(24 * 3600))),
+    backend=backend_from_env("CRAWL", "crawl", default="disk"),
+)
+search_cache = TTLCache(
+    maxsize=int(os.getenv("SEARCH_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", str(6 * 3600))),
+    backend=backend_from_env("SEARCH", "search", default="disk"),
+)
+
+_inflight: Dict[str, _Flight] = {}
+_inflight_guard = threading.Lock()
+
+_refresh: contextvars.ContextVar[bool] = contextvars.ContextVar("web_cache_refresh", default=False)
+
+
+def refreshing() -> bool:
+    """Whether the caller runs inside ``web_cache_refresh()``."""
+    return _refresh.get()
+
+
+@contextmanager
+def web_cache_refresh() -> Iterator[None]:
+    """Fetch every crawl and search inside the block again, replacing cached results."""
+    token = _refresh.set(True)
+    try:
+        yield
+    finally:
+        _refresh.reset(token)
+
+
+def _normalize(name: str, value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    value = " ".join(value.split())
+    if name == "url":
+        return value.rstrip("/")
+    if name in ("search_query", "query"):
+        return value.lower()
+    return value
+
+
+def cache_key(tool_id: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    normalized = {k: _normalize(k, v) for k, v in kwargs.items() if v is not None}
+    return json.dumps([tool_id, list(args), normalized], sort_keys=True, default=str)
+
+
+class _Flight:
+    """Callers of one key: they fetch one at a time, and the last one out removes it."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.callers = 0
+        self.fetched_at = float("-inf")  # time.monotonic() of the last completed fetch
+
+
+def cached_call(cache: TTLCache, key: str, fetch: Callable[[], Any], refresh: bool = False) -> Any:
+    """Return the cached value for ``key`` or fetch and cache it, once per key at a time.
+
+    ``refresh`` ignores the cached value and replaces it; callers that waited
+    behind a fetch that started after they arrived reuse its value instead of
+    fetching again. Failed calls raise and are not cached.
+    """
+    value = None if refresh else cache.get(key)
+    if value is not None:
+        return value
+    arrived = time.monotonic()
+    with _inflight_guard:
+        flight = _inflight.setdefault(key, _Flight())
+        flight.callers += 1
+    try:
+        with flight.lock:
+            if not refresh or flight.fetched_at >= arrived:
+                value = cache.get(key)
+                if value is not None:
+                    return value
+            value = fetch()
+            if value is not None:
+                cache.set(key, value)
+                flight.fetched_at = time.monotonic()
+            return value
+    finally:
+        with _inflight_guard:
+            flight.callers -= 1
+            if not flight.callers:
+                _inflight.pop(key, None)
+
+
+def web_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the crawl and search caches."""
+    return {"crawl": crawl_cache.stats(), "search": search_cache.stats()}
+
+
+class CachedCrawlTool(CrawlTool):
+    """``CrawlTool`` answering repeated crawls of the same page from ``crawl_cache``."""
+
+    use_cache: bool = True
+    max_output_tokens: int = TOOL_OUTPUT_TOKEN_BUDGET
+
+    def run(self, ctx: ToolRunContext, *args: Any, **kwargs: Any) -> Any:
+        fetch = lambda: super(CachedCrawlTool, self).run(ctx, *args, **kwargs)
+        if not self.use_cache:
+            return trim_tool_output(fetch(), self.max_output_tokens)
+        result = cached_call(crawl_cache, cache_key(self.id, args, kwargs), fetch, _refresh.get())
+        return trim_tool_output(result, self.max_output_tokens)
+
+
+class CachedSearchTool(SearchTool):
+    """``SearchTool`` answering repeated queries from ``search_cache``."""
+
+    use_cache: bool = True
+    max_output_tokens: int = TOOL_OUTPUT_TOKEN_BUDGET
+
+    def run(self, ctx: ToolRunContext, *args: Any, **kwargs: Any) -> Any:
+        fetch = lambda: super(CachedSearchTool, self).run(ctx, *args, **kwargs)
+        if not self.use_cache:
+            return trim_tool_output(fetch(), self.max_output_tokens)
+        result = cached_call(search_cache, cache_key(self.id, args, kwargs), fetch, _refresh.get())
+        return trim_tool_output(result, self.max_output_tokens)
@@ -1,37 +1,93 @@
 from __future__ import annotations
+import json
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 
-from config.portia import config
+from config.portia import get_config
 from portia import Portia
-from portia.open_source_tools.crawl_tool import CrawlTool
-from portia.open_source_tools.search_tool import SearchTool
+from tools.web_cache import CachedCrawlTool, CachedSearchTool, refreshing
 from tools.pdf_reader import PdfToMarkdownTool
+from evaluation.checkpoints import CHECKPOINT_HOOKS
+from evaluation.jd_cache import get_jd_prompt_block
+from evaluation.plan_templates import get_plan_template, plan_inputs, run_plan_template
+from evaluation.prompts import fill_inputs, fit_inputs, print_token_report
+from evaluation.results import summarize_plan_run
 
 class EvalInput(BaseModel):
     """Input for platform evaluation. Currently requires the platform-specific URL."""
     url: str
 
 
-def evaluate_platform(userId: str, platform: str, data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+EVAL_INPUT_DESCRIPTIONS = {
+    "$profile_url": "URL of the candidate's profile on the platform being evaluated",
+    "$jd_criteria": "Pre-extracted JD criteria to relate the profile to, or 'Not provided'",
+}
+
+
+# The final JSON every platform prompt asks for (validated as ``EvaluationResult``).
+OUTPUT_FORMAT = """
+        Do not compute an overall score; it is computed from the criterion scores afterwards.
+
+        Output Format (JSON):
+        {
+          "platform": "{platform}",
+          "url": "$profile_url",
+          "criteria": {
+            "commits": {
+              "score": <float>,
+              "explanation": "<brief explanation with key metrics>"
+            },
+            "code_quality": {
+              "score": <float>,
+              "explanation": "<brief explanation with key metrics>"
+            },
+            "recent_work_consistency": {
+              "score": <float>,
+              "explanation": "<brief explanation with key metrics>"
+            }
+          },
+          "notes": ["<any additional notes or limitations>"]
+        }
+"""
+
+
+def output_format(platform: str) -> str:
+    return OUTPUT_FORMAT.replace("{platform}", platform)
+
+
+def evaluate_platform(userId: str, platform: str, data: Optional[Dict[str, Any]] = None,
+                      jd_url: Optional[str] = None, keep_raw: bool = False,
+                      tier: str = "pro") -> Dict[str, Any]:
     """
     Evaluate a user's profile on a specific platform based on common criteria.
     
     This function serves as a template for evaluating different platforms.
-    It uses Portia to plan and execute the evaluation based on a platform-specific prompt.
+    It uses Portia to execute the evaluation based on a platform-specific prompt. The
+    prompt only references plan inputs, so it is planned once per platform and the
+    compiled plan is reused with each candidate's inputs (see evaluation.plan_templates).
     
     Args:
         userId: The user's document ID (for potential DB integration).
         platform: The platform to evaluate (e.g., 'github', 'leetcode', 'x', 'linkedin').
         data: Optional dict containing 'url' for the platform profile.
+        jd_url: Optional JD the profile is being screened against. Its cached
+                criteria are added to the prompt as context.
+        keep_raw: Also return the full plan run, zlib-compressed, under 'raw_run'.
+        tier: Model tier of the run (see config.portia); scoring needs 'pro'.
     
     Returns:
-        A dict with evaluation results in JSON-like structure, or None on error.
+        A compact summary of the plan run (plan_run_id, state, the parsed
+        'final_output' JSON and 'error', see evaluation.results). A failed run
+        is returned with state FAILED and its error; running the same profile
+        again resumes it from its last completed step (see evaluation.checkpoints),
+        except inside ``web_cache_refresh()``, where it starts over.
+        Errors outside the plan run are raised.
     
     To add a new platform:
     1. Add a case in the if-elif chain for the platform.
-    2. Define a tailored prompt with steps for data extraction and scoring.
-    3. Specify tools relevant to the platform (e.g., CrawlTool for web scraping, SearchTool for supplementary searches).
+    2. Define a tailored prompt with steps for data extraction and scoring. Refer to the
+       profile as $profile_url rather than formatting the URL into the prompt.
+    3. Specify tools relevant to the platform (e.g., CachedCrawlTool for web scraping, CachedSearchTool for supplementary searches).
     4. Ensure the output JSON format is consistent across platforms for easy aggregation.
     """
     if not data or 'url' not in data:
@@ -42,10 +98,10 @@ def evaluate_platform(userId: str, platform: str, data: Optional[Dict[str, Any]]
 
     # Platform-specific prompts and tools
     if platform == 'github':
-        prompt = f"""
+        prompt = """
         GitHub Profile Evaluator Tool
 
-        Your goal is to evaluate the GitHub profile at {url} based on these criteria:
+        Your goal is to evaluate the GitHub profile at $profile_url based on these criteria:
         - Commits: Total number and volume of commits across repositories.
         - Code Quality: Based on stars, forks, issue resolution, code organization (if accessible).
         - Recent Work Consistency: Frequency and recency of commits/contributions in the last 12 months.
@@ -67,100 +123,134 @@ def evaluate_platform(userId: str, platform: str, data: Optional[Dict[str, Any]]
         - Code Quality: High average stars/forks (>50 per repo) and low open issues ratio → 10.
         - Recent Work Consistency: Commits in >80% of weeks in last year → 10; sporadic → low score.
 
-        Step 5: Compute overall platform score as weighted average.
-        Weights: Commits=1, Code Quality=0.2, Recent Work Consistency=0.4.
-        Formula: (commits_score * 1 + code_quality_score * 0.2 + recent_consistency_score * 0.4) / (1 + 0.2 + 0.4)
-
-        Output Format (JSON):
-        {{
-          "platform": "github",
-          "url": "{url}",
-          "criteria": {{
-            "commits": {{
-              "score": <float>,
-              "explanation": "<brief explanation with key metrics>"
-            }},
-            "code_quality": {{
-              "score": <float>,
-              "explanation": "<brief explanation with key metrics>"
-            }},
-            "recent_work_consistency": {{
-              "score": <float>,
-              "explanation": "<brief explanation with key metrics>"
-            }}
-          }},
-          "overall_score": <float>,
-          "notes": ["<any additional notes or limitations>"]
-        }}
-
+        """ + output_format("github") + """
         Important Guidelines:
         - Prioritize direct crawling over search.
         - Handle private repos or limited access gracefully (note if data is incomplete).
         - Verify all data belongs to the correct user.
         - Do not fabricate metrics; base scores on evidence.
         """
-        tools = [CrawlTool(), SearchTool()]
+        tools = [CachedCrawlTool(), CachedSearchTool()]
 
     elif platform == 'leetcode':
-        # Template for LeetCode - customize prompt similarly
-        prompt = f"""
+        prompt = """
         LeetCode Profile Evaluator Tool
 
-        Your goal is to evaluate the LeetCode profile at {url} based on these criteria:
-        - Commits: N/A or map to problems solved.
-        - Code Quality: Based on acceptance rate, difficulty of problems, contest ratings.
-        - Recent Work Consistency: Frequency of submissions in the last 12 months.
+        Your goal is to evaluate the LeetCode profile at $profile_url based on these criteria:
+        - Commits: Volume of problems solved (easy, medium and hard counts).
+        - Code Quality: Acceptance rate, share of medium/hard problems and contest rating.
+        - Recent Work Consistency: Frequency of accepted submissions in the last 12 months.
 
-        # ... (Add steps similar to GitHub: crawl profile, extract solved problems, rating, submission history)
-        # Use similar scoring and output format.
+        Process:
+        Step 1: Use the crawl_tool to fetch the profile page.
+        Extract: Username, total solved, easy/medium/hard solved, acceptance rate, ranking,
+        contest rating and contests attended, submission calendar or recent submissions.
+
+        Step 2: If the profile page does not render these numbers, use search_tool for
+        "site:leetcode.com [username]" to supplement data.
+
+        Step 3: Assign scores (0-10) for each criterion based on extracted data.
+        Examples:
+        - Commits: >500 problems solved → 10; 200-500 → 7; <50 → 2.
+        - Code Quality: >40% of solved problems medium/hard and contest rating >1800 → 10.
+        - Recent Work Consistency: Submissions in >80% of weeks in last year → 10; sporadic → low score.
+        """ + output_format("leetcode") + """
+        Important Guidelines:
+        - Prioritize direct crawling over search.
+        - Verify all data belongs to the correct user.
+        - Do not fabricate metrics; base scores on evidence.
         """
-        tools = [CrawlTool(), SearchTool()]
-        # Note: Implement full prompt as needed.
+        tools = [CachedCrawlTool(), CachedSearchTool()]
 
     elif platform == 'x':
-        # Template for X (Twitter)
-        prompt = f"""
+        prompt = """
         X Profile Evaluator Tool
 
-        Your goal is to evaluate the X profile at {url} based on these criteria:
-        - Commits: N/A or map to post volume on tech topics.
-        - Code Quality: Based on engagement (likes, retweets) on code-related posts.
-        - Recent Work Consistency: Posting frequency in the last 12 months.
+        Your goal is to evaluate the X profile at $profile_url based on these criteria:
+        - Commits: Volume of posts on technical topics (code, projects, engineering).
+        - Code Quality: Substance of and engagement (likes, reposts, replies) on technical posts.
+        - Recent Work Consistency: Posting frequency on technical topics in the last 12 months.
+
+        Process:
+        Step 1: Use the crawl_tool to fetch the profile page.
+        Extract: Handle, bio, followers, and the most recent posts with their dates and engagement.
+
+        Step 2: X often serves a login wall to crawlers. If the posts are not visible, use
+        search_tool for "site:x.com [handle]" and "[handle] twitter" to find indexed posts.
 
-        # ... (Add steps: crawl profile, extract posts, engagement metrics)
-        # Note: May need X-specific tools if available, but use CrawlTool/SearchTool.
+        Step 3: Assign scores (0-10) for each criterion based on extracted data.
+        Examples:
+        - Commits: Several technical posts per week → 10; a few per month → 5; none → 0.
+        - Code Quality: Detailed technical threads with strong engagement → 10; reposts only → low score.
+        - Recent Work Consistency: Technical posts in most months of the last year → 10.
+        """ + output_format("x") + """
+        Important Guidelines:
+        - Only score posts that are visible; note in "notes" if the profile could not be read.
+        - Verify all data belongs to the correct user.
+        - Do not fabricate metrics; base scores on evidence.
         """
-        tools = [CrawlTool(), SearchTool()]
+        tools = [CachedCrawlTool(), CachedSearchTool()]
 
     elif platform == 'linkedin':
-        # Template for LinkedIn
-        prompt = f"""
+        prompt = """
         LinkedIn Profile Evaluator Tool
 
-        Your goal is to evaluate the LinkedIn profile at {url} based on these criteria:
-        - Commits: N/A or map to project updates.
-        - Code Quality: Based on endorsements, skills, project descriptions.
-        - Recent Work Consistency: Activity like posts, job changes in last 12 months.
+        Your goal is to evaluate the LinkedIn profile at $profile_url based on these criteria:
+        - Commits: Volume of documented technical work (projects, roles, publications).
+        - Code Quality: Depth of experience, skills with endorsements and project descriptions.
+        - Recent Work Consistency: Recent roles, posts and activity in the last 12 months.
+
+        Process:
+        Step 1: Use the crawl_tool to fetch the profile page (experience, skills, projects, activity).
+        If the profile links a resume PDF, read it with the PDF tool.
+
+        Step 2: LinkedIn often serves a login wall to crawlers. If the sections are not
+        visible, use search_tool for "site:linkedin.com/in [name]" to find public details.
 
-        # ... (Add steps: crawl profile sections - experience, skills, activity)
+        Step 3: Assign scores (0-10) for each criterion based on extracted data.
+        Examples:
+        - Commits: Several substantial technical projects or roles → 10; one → 4; none → 0.
+        - Code Quality: Senior-level responsibilities and relevant endorsed skills → 10.
+        - Recent Work Consistency: Current technical role and recent activity → 10; stale profile → low score.
+        """ + output_format("linkedin") + """
+        Important Guidelines:
+        - Only score sections that are visible; note in "notes" if the profile could not be read.
+        - Verify all data belongs to the correct user.
+        - Do not fabricate metrics; base scores on evidence.
         """
-        tools = [CrawlTool(), SearchTool(), PdfToMarkdownTool()]  
+        tools = [CachedCrawlTool(), CachedSearchTool(), PdfToMarkdownTool()]
 
     else:
         raise ValueError(f"Unsupported platform: {platform}")
 
+    # The JD context is a plan input too, so one compiled plan serves every JD.
+    prompt += """
+        Job Context:
+        $jd_criteria
+        If job context is provided, add a note on how the profile relates to these JD criteria.
+        """
+    # The prompt with its inputs filled in must fit the step token budget, so
+    # a long JD is trimmed rather than carried whole into every step.
+    values = fit_inputs(prompt, {
+        "$profile_url": url,
+        "$jd_criteria": get_jd_prompt_block(jd_url) if jd_url else "Not provided",
+    })
+    inputs = plan_inputs(EVAL_INPUT_DESCRIPTIONS, values)
+
     # Initialize and run Portia
     portia = Portia(
-        config=config,
+        config=get_config(tier),
         tools=tools,
+        execution_hooks=CHECKPOINT_HOOKS,
     )
 
-    plan = portia.plan(prompt)
-    print(plan.pretty_print())  # Optional: For debugging
-    plan_run = portia.run_plan(plan)
-    print(plan_run.model_dump_json(indent=2))  # Optional: For debugging
+    # The plan is compiled once per platform and tier and reused for every
+    # candidate; each tier runs the plan its own planning model produced.
+    name = f"evaluate_{platform}_{tier}"
+    # A refreshed run must not resume a checkpoint holding previously crawled step outputs.
+    plan_run = run_plan_template(portia, name, prompt, inputs, resume=not refreshing())
+    print_token_report(plan_run, fill_inputs(prompt, values), get_plan_template(portia, name, prompt, inputs))
 
-    try:
-        return plan_run.model_dump()
-    except Exception:
-        return None
\ No newline at end of file
+    summary = summarize_plan_run(plan_run, keep_raw)
+    print(json.dumps(summary["final_output"], indent=2))  # Optional: For debugging
+    return summary
@@ -1,14 +1,18 @@
 from __future__ import annotations
 from pydantic import BaseModel
 # from portia.builder import PlanBuilderV2, StepOutput, Input
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
-from config.portia import config
+from config.portia import get_config
 from portia import Portia
 # from portia.open_source_tools.pdf_reader_tool import PDFReaderTool
-from portia.open_source_tools.crawl_tool import CrawlTool
-from portia.open_source_tools.search_tool import SearchTool
+from tools.web_cache import CachedCrawlTool, CachedSearchTool
 from tools.pdf_reader import PdfToMarkdownTool
+from evaluation.batch import PLATFORM_URL_FIELDS
+from evaluation.checkpoints import CHECKPOINT_HOOKS
+from evaluation.plan_templates import plan_inputs, run_plan_template
+from evaluation.results import parse_json_output
+from models.user import Socials, User
 
 
 class SocialInput(BaseModel):
@@ -25,7 +29,24 @@ class SocialInput(BaseModel):
     portfolio_url: Optional[str] = None
 
 
-def scrapeSocials(userId: str, data: Optional[Dict[str, Any]] = None):
+# Keys used in the scraper output -> evaluation platform names.
+SOCIAL_PLATFORM_KEYS = {
+    "github": "github",
+    "leetcode": "leetcode",
+    "linkedin": "linkedin",
+    "twitter": "x",
+    "x": "x",
+}
+
+
+SOCIAL_INPUT_DESCRIPTIONS = {
+    "$resume_url": "URL of the candidate's resume, or 'Not provided'",
+    "$portfolio_url": "URL of the candidate's portfolio website, or 'Not provided'",
+    "$known_socials": "Social profile URLs already known for the candidate, or 'None'",
+}
+
+
+def scrapeSocials(userId: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Collect or update a user's social/profile URLs.
 
     Args:
@@ -41,7 +62,12 @@ def scrapeSocials(userId: str, data: Optional[Dict[str, Any]] = None):
               Extra keys are ignored. Missing keys are treated as None.
 
     Returns:
-        A dict-like structure with the social/profile URLs discovered or provided, or None.
+        The plan run dump; its final output holds the social/profile URLs
+        discovered or provided (see ``discovered_socials``).
+
+    Raises:
+        RuntimeError: If the plan run failed. Calling again with the same
+            inputs resumes it from its last completed step.
     """
 
     # Validate and normalize input dictionary so all expected fields are present or None
@@ -51,15 +77,9 @@ def scrapeSocials(userId: str, data: Optional[Dict[str, Any]] = None):
 
     # socials, resume_url, portfolio_url = user.socials, user.resume_url, user.portfolio_url
 
-    # Build a dynamic prompt from provided optional data
-    resume_line = (
-        f"Resume URL: {social_input.resume_url}"
-        if social_input.resume_url else "Resume URL: Not provided"
-    )
-    portfolio_line = (
-        f"Portfolio URL: {social_input.portfolio_url}"
-        if social_input.portfolio_url else "Portfolio URL: Not provided"
-    )
+    # Per-user values are passed as plan inputs so the plan is compiled once
+    resume_value = social_input.resume_url or "Not provided"
+    portfolio_value = social_input.portfolio_url or "Not provided"
     known_socials = []
     if social_input.githubUrl:
         known_socials.append(f"GitHub: {social_input.githubUrl}")
@@ -69,13 +89,12 @@ def scrapeSocials(userId: str, data: Optional[Dict[str, Any]] = None):
         known_socials.append(f"LeetCode: {social_input.leetcodeUrl}")
     if social_input.xUrl:
         known_socials.append(f"X/Twitter: {social_input.xUrl}")
-    known_block = ("\nKnown socials (may be partial):\n- " + "\n- ".join(known_socials)) if known_socials else ""
-
+    known_value = ("\n- " + "\n- ".join(known_socials)) if known_socials else "None"
 
-    prompt =f"""
-    {resume_line}
-    {portfolio_line}
-    {known_block}""" + """
+    prompt = """
+    Resume URL: $resume_url
+    Portfolio URL: $portfolio_url
+    Known socials (may be partial): $known_socials
 
 Social Link Extractor Tool
 Your goal is to gather a specific set of links for a given user from provided URLs. The required links are:
@@ -211,17 +230,97 @@ resolve to web_search tool
 
 If a link cannot be found after exhaustive analysis, mark it as "Not found" with a brief explanation of what was checked.
     """
+    # Link discovery is extraction work: the fast model tier is enough.
     portia = Portia(
-        config=config,
-        tools=[CrawlTool(), PdfToMarkdownTool(), SearchTool()],
+        config=get_config("fast"),
+        tools=[CachedCrawlTool(), PdfToMarkdownTool(), CachedSearchTool()],
+        execution_hooks=CHECKPOINT_HOOKS,
     )
 
-    plan = portia.plan(prompt)
-    print(plan.pretty_print())
-    plan_run = portia.run_plan(plan)
+    inputs = plan_inputs(SOCIAL_INPUT_DESCRIPTIONS, {
+        "$resume_url": resume_value,
+        "$portfolio_url": portfolio_value,
+        "$known_socials": known_value,
+    })
+    plan_run = run_plan_template(portia, "scrape_socials", prompt, inputs)
     print(plan_run.model_dump_json(indent=2))
+    result = plan_run.model_dump()
+    if str(result.get("state", "")).upper() == "FAILED":
+        error = ((result.get("outputs") or {}).get("final_output") or {}).get("value")
+        raise RuntimeError(f"Social link discovery failed for user {userId}: {error}")
     # Return the structured result for downstream usage
-    try:
-        return plan_run.model_dump()
-    except Exception:
-        return None
\ No newline at end of file
+    return result
+
+
+def discovered_socials(output: Any) -> Dict[str, Optional[str]]:
+    """Profile URL per platform from a ``scrapeSocials`` result; None where it was not found.
+
+    Accepts the plan run dump returned by ``scrapeSocials`` or its final JSON,
+    either nested under ``extracted_links.social_media`` or flat like
+    ``examples/x.json``. Platforms the output does not mention are left out.
+    """
+    if isinstance(output, dict) and "outputs" in output:
+        output = ((output.get("outputs") or {}).get("final_output") or {}).get("value")
+    data = parse_json_output(output) or {}
+    links = (data.get("extracted_links") or {}).get("social_media") or data
+
+    socials: Dict[str, Optional[str]] = {}
+    for key, platform in SOCIAL_PLATFORM_KEYS.items():
+        entry = links.get(key)
+        if not isinstance(entry, dict):
+            continue
+        found = str(entry.get("status", "found")).strip().lower() == "found"
+        socials[platform] = entry.get("url") if found and entry.get("url") else None
+    return socials
+
+
+def missing_socials(user: User) -> List[str]:
+    """Platforms with no profile URL on record that discovery has not ruled out yet."""
+    socials = user.socials
+    if socials is None:
+        return list(PLATFORM_URL_FIELDS)
+    return [p for p, field in PLATFORM_URL_FIELDS.items()
+            if not getattr(socials, field, "") and p not in socials.notFound]
+
+
+def save_discovered_socials(user: User, discovered: Any) -> Dict[str, Optional[str]]:
+    """Store a ``scrapeSocials`` result on ``user.socials`` and save the user.
+
+    Empty profile URLs are filled in; platforms discovery found no profile on
+    are recorded in ``notFound``, so later evaluations skip them without
+    searching again. Known URLs are never overwritten.
+
+    Args:
+        discovered: The ``scrapeSocials`` result, or its ``discovered_socials`` form.
+
+    Returns:
+        The discovered URL per platform (None where no profile was found).
+    """
+    socials = discovered if isinstance(discovered, dict) and all(
+        v is None or isinstance(v, str) for v in discovered.values()) else discovered_socials(discovered)
+    if user.socials is None:
+        user.socials = Socials()
+    for platform, url in socials.items():
+        field = PLATFORM_URL_FIELDS.get(platform)
+        if not field or getattr(user.socials, field, ""):
+            continue
+        if url:
+            setattr(user.socials, field, url)
+        elif platform not in user.socials.notFound:
+            user.socials.notFound.append(platform)
+    user.save()
+    return socials
+
+
+def discover_socials(user: User) -> Dict[str, Optional[str]]:
+    """Run link discovery from the user's resume, portfolio and known profiles and store the result.
+
+    Raises:
+        RuntimeError: If the discovery run failed (see ``scrapeSocials``).
+    """
+    socials = user.socials or Socials()
+    data = {field: getattr(socials, field, "") or None for field in PLATFORM_URL_FIELDS.values()}
+    data.update(resume_url=user.resume_url, portfolio_url=user.portfolio_url)
+    # A platform the output does not mention was not found either.
+    missing = {p: None for p in missing_socials(user)}
+    return save_discovered_socials(user, {**missing, **discovered_socials(scrapeSocials(str(user.id), data))})